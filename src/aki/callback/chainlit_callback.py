@@ -246,6 +246,8 @@ class ChainlitCallback(AsyncCallbackHandler):
         """Initialize the callback handler with necessary state tracking."""
         super().__init__()
         self.response_message = None
+        # True while response_message has content that hasn't been finalized
+        self.response_message_dirty = False
         self.loading_message = None  # Track the loading message indicator
         self.thinking_step = None
         self.thinking_step_id = None  # Keep track of last thinking step ID
@@ -497,6 +499,7 @@ class ChainlitCallback(AsyncCallbackHandler):
                 # Stream to response message
                 await self._ensure_response_message(author)
                 await self.response_message.stream_token(extracted_content)
+                self.response_message_dirty = True
                 logger.debug(
                     f"Streamed text content to message: {extracted_content[:50]}"
                 )
@@ -553,6 +556,7 @@ class ChainlitCallback(AsyncCallbackHandler):
                     # No tokens were streamed - will handle content through loading message
                     logger.debug("No tokens streamed, preparing to use loading message")
                     self.response_message = self.loading_message
+                    self.response_message_dirty = True
                 else:
                     # We've started streaming but loading message wasn't used, clean it up
                     logger.debug("Removing unused loading message")
@@ -673,6 +677,7 @@ class ChainlitCallback(AsyncCallbackHandler):
 
                     # Add the text content
                     await self.response_message.stream_token(text_content)
+                    self.response_message_dirty = True
                     logger.debug(
                         f"Displayed non-streaming text: {text_content[:50]}..."
                     )
@@ -695,6 +700,7 @@ class ChainlitCallback(AsyncCallbackHandler):
             if self.response_message:
                 logger.debug("Finalizing response message to remove animated dot")
                 await self.response_message.update()
+                self.response_message_dirty = False
 
         except Exception as e:
             logger.error(f"Error in on_llm_end: {str(e)}")
@@ -1,3 +1,5 @@
+import os
+
 MCP_SERVERS_KEY = "mcpServers"
 
 DEFAULT_MODEL = "(bedrock)us.anthropic.claude-3-7-sonnet-20250219-v1:0"
@@ -8,3 +10,7 @@ DEFAULT_TOKENIZER_MODEL = "o200k_base"
 # Default reasoning settings
 DEFAULT_BUDGET_TOKENS = 4096
 DEFAULT_REASONING_ENABLED = True
+
+# Chat history persistence flag. Refreshed by ``initialize_aki`` once the
+# .env file has been loaded so hot paths can read it without touching os.environ.
+CHAT_HISTORY_ENABLED = os.getenv("AKI_CHAT_HISTORY_ENABLED", "false").lower() == "true"
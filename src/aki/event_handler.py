@@ -1,6 +1,5 @@
 """EventHandler for Aki application."""
 
-import os
 import logging
 import json
 
@@ -10,6 +9,7 @@ from langchain.schema.runnable.config import RunnableConfig
 from langchain_core.messages import AIMessage, ToolMessage
 from langchain_core.runnables import Runnable
 
+from aki.config import constants
 from aki.persistence.dal import StateDAL
 from aki.persistence.database_factory import db_manager
 from aki.chat.profile_factory import BaseProfile, ProfileFactory
@@ -20,6 +20,9 @@ from aki.chat.export_conversation import (
     register_export_command,
 )
 
+# Pre-encoded tool result attached to pending tool calls when the user stops
+TOOL_ABORTED_RESULT = json.dumps({"error": "Tool execution aborted by user"})
+
 
 class EventHandler:
     """Handles all Chainlit events and maintains application state."""
@@ -99,9 +102,7 @@ class EventHandler:
                 settings = await profile.get_chat_settings()
                 await self.handle_settings_update(settings)
 
-            logging.debug(
-                f"[start_chat] Completed. Final state: {cl.user_session.get('state')}"
-            )
+            logging.debug(f"[start_chat] Completed. Final state: {state}")
         except Exception as e:
             logging.error(f"[start_chat] Failed to initialize chat: {e}", exc_info=True)
             raise
@@ -145,10 +146,8 @@ class EventHandler:
             if key in state:
                 state[key] = settings[key]
 
-        cl.user_session.set("state", state)
-        logging.debug(
-            f"[on_settings_update] Updated state: {cl.user_session.get('state')}"
-        )
+        # state is the session's own dict, so in-place updates need no set back
+        logging.debug(f"[on_settings_update] Updated state: {state}")
 
     async def handle_stop(self):
         """Handle stop event."""
@@ -158,16 +157,15 @@ class EventHandler:
         if isinstance(message, AIMessage) and message.tool_calls:
             logging.debug(f"[on_stop] Found tool_use in last message: {messages[-1]}")
             for tool_call in message.tool_calls:
-                tool_result = (json.dumps({"error": "Tool execution aborted by user"}),)
                 messages.append(
                     ToolMessage(
-                        content=json.dumps(tool_result),
+                        content=TOOL_ABORTED_RESULT,
                         name=tool_call["name"],
                         tool_call_id=tool_call["id"],
                     )
                 )
                 logging.debug(
-                    f"[on_stop] {tool_call['name']} \nInput: {tool_call['args']}, \nOutput: {tool_result}"
+                    f"[on_stop] {tool_call['name']} \nInput: {tool_call['args']}, \nOutput: {TOOL_ABORTED_RESULT}"
                 )
 
         assistant_contents = []
@@ -204,14 +202,12 @@ class EventHandler:
             and self.chainlit_callback.response_message
         ):
             await self.chainlit_callback.response_message.update()
+            self.chainlit_callback.response_message_dirty = False
 
     async def handle_chat_end(self):
         """Handle chat end event and save state if needed."""
         # Check if chat history is enabled in configuration
-        chat_history_enabled = (
-            os.getenv("AKI_CHAT_HISTORY_ENABLED", "false").lower() == "true"
-        )
-        if not chat_history_enabled:
+        if not constants.CHAT_HISTORY_ENABLED:
             logging.debug("Chat history is disabled. Not saving state.")
             return
 
@@ -366,12 +362,11 @@ class EventHandler:
                     # Merge final LangGraph output with existing state
                     state.update(output["data"]["output"])
 
-            # Finalize response message if it exists
-            if self.chainlit_callback.response_message:
-                await self.chainlit_callback.response_message.update()
-
-            # Save updated state
-            cl.user_session.set("state", state)
+            # Finalize response message only if content is still pending
+            response_message = self.chainlit_callback.response_message
+            if response_message and self.chainlit_callback.response_message_dirty:
+                await response_message.update()
+                self.chainlit_callback.response_message_dirty = False
 
         except Exception as e:
             error_msg = f"An error occurred: {e!s}."
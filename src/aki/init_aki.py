@@ -1,6 +1,5 @@
 """Initialize Aki configuration and services."""
 
-import shutil
 import sys
 from pathlib import Path
 import logging
@@ -19,7 +18,7 @@ def initialize_mcp_settings():
     settings_path = aki_dir / "mcp_settings.json"
 
     if not settings_path.exists() and template_path.exists():
-        shutil.copy2(template_path, settings_path)
+        settings_path.write_bytes(template_path.read_bytes())
         logger.info(f"Initialized MCP settings at {settings_path}")
 
 
@@ -37,7 +36,7 @@ def ensure_env_variables_updated() -> None:
 
     # If no .env file exists, simply create one from template
     if not env_path.exists():
-        shutil.copy2(template_path, env_path)
+        env_path.write_bytes(template_path.read_bytes())
         logger.info(f"Created new .env file at {env_path}")
         return
 
@@ -105,6 +104,11 @@ def initialize_aki():
     # Load environment variables from the updated .env file
     load_dotenv(get_env_file())
 
+    # Env-backed flags don't change at runtime, so resolve them once here
+    constants.CHAT_HISTORY_ENABLED = (
+        os.getenv("AKI_CHAT_HISTORY_ENABLED", "false").lower() == "true"
+    )
+
     # Validate and set token threshold
     validate_and_set_token_threshold()
 
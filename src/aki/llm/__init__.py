@@ -1,22 +1,45 @@
 """LLM module for Aki."""
 
+import importlib
+from functools import partial
+
 # Import capabilities first since they are used by other modules
 from .capabilities import ModelCapability
 
 # Then import provider base classes
 from .providers.base import LLMProvider, LLMModel
 
-# Then import concrete provider implementations
-from .providers.bedrock import BedrockProvider
-from .providers.ollama import OllamaProvider
-
 # Finally import and initialize factory
 from .factory import LLMFactory
 
+# Concrete providers pull in heavy SDKs (boto3, ollama), so they are only
+# imported when the factory first needs them or on attribute access
+_LAZY_PROVIDERS = {
+    "BedrockProvider": ".providers.bedrock",
+    "OllamaProvider": ".providers.ollama",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_PROVIDERS:
+        module = importlib.import_module(_LAZY_PROVIDERS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _load_provider(name: str) -> LLMProvider:
+    """Import a concrete provider class and create an instance of it."""
+    return __getattr__(name)()
+
+
 # Create a default factory instance
 llm_factory = LLMFactory()
-llm_factory.register_provider("bedrock", BedrockProvider())
-llm_factory.register_provider("ollama", OllamaProvider())
+llm_factory.register_lazy_provider(
+    "bedrock", partial(_load_provider, "BedrockProvider")
+)
+llm_factory.register_lazy_provider("ollama", partial(_load_provider, "OllamaProvider"))
 
 __all__ = [
     "llm_factory",
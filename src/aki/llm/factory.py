@@ -1,18 +1,104 @@
-from typing import Dict, Optional, List, Set, Tuple
+from collections import OrderedDict
+from typing import Any, Callable, Dict, FrozenSet, NamedTuple, Optional, List, Tuple
 import logging
+import re
+import sys
+import threading
 from langchain_core.language_models.chat_models import BaseChatModel
 from .capabilities import ModelCapability
 from .providers.base import LLMProvider
 
+# kwargs that are keyed explicitly or must not affect LLM caching
+_CACHE_KEY_SKIP = frozenset(
+    {
+        "temperature",
+        "enable_prompt_cache",
+        "reasoning_config",
+        "name",
+        "model",
+        "tools",
+    }
+)
+# Only simple values take part in the cache key
+_SCALAR_TYPES = (bool, int, float, str)
+# Cache key defaults for settings the caller didn't pass
+_DEFAULT_TEMPERATURE = 0.6
+_DEFAULT_PROMPT_CACHE = False
+_NO_EXTRA_KWARGS: frozenset = frozenset()
+_EMPTY_CAPS: frozenset = frozenset()
+
+
+class _CacheParams(NamedTuple):
+    """create_model settings that are keyed explicitly in the LLM cache."""
+
+    temperature: float
+    enable_prompt_cache: bool
+    budget_tokens: Optional[int]
+
+
+_DEFAULT_CACHE_PARAMS = _CacheParams(_DEFAULT_TEMPERATURE, _DEFAULT_PROMPT_CACHE, None)
+
+
+def _extract_cache_params(kwargs: Dict[str, Any]) -> _CacheParams:
+    """Extract the explicitly keyed settings from create_model kwargs.
+
+    Args:
+        kwargs: Model parameters passed to create_model
+
+    Returns:
+        _CacheParams with defaults applied and temperature rounded
+    """
+    if not kwargs:
+        return _DEFAULT_CACHE_PARAMS
+
+    temperature = kwargs.get("temperature", _DEFAULT_TEMPERATURE)
+
+    # Special handling for reasoning_config
+    budget_tokens = None
+    reasoning_config = kwargs.get("reasoning_config", None)
+    if reasoning_config:
+        if hasattr(reasoning_config, "budget_tokens"):
+            budget_tokens = reasoning_config.budget_tokens
+        elif isinstance(reasoning_config, dict) and "budget_tokens" in reasoning_config:
+            budget_tokens = reasoning_config["budget_tokens"]
+
+    return _CacheParams(
+        round(float(temperature), 1),  # Round to 1 decimal place for caching
+        kwargs.get("enable_prompt_cache", _DEFAULT_PROMPT_CACHE),
+        budget_tokens,
+    )
+
 
 class LLMFactory:
     """Factory for creating and managing LLM instances."""
 
-    # Class-level cache for LLM instances
-    _llm_cache: Dict[str, BaseChatModel] = {}
+    # Maximum number of LLM instances kept per factory
+    _llm_cache_maxsize = 64
 
     def __init__(self):
         self._providers: Dict[str, LLMProvider] = {}
+        # Loaders of providers registered lazily, replaced by the provider
+        # instance on first use
+        self._provider_loaders: Dict[str, Callable[[], LLMProvider]] = {}
+        # Every registered prefix, in registration order
+        self._prefixes: List[str] = []
+        # Held while a lazily registered provider is created, so concurrent
+        # first uses run its loader only once
+        self._provider_lock = threading.Lock()
+        # LRU cache of LLM instances, owned by this factory
+        self._llm_cache: "OrderedDict[Tuple, BaseChatModel]" = OrderedDict()
+        # Matches the "(provider)" prefix of a model id, rebuilt on registration
+        self._dispatch_re: Optional[re.Pattern] = None
+        # Parsed (provider_name, model_name, capabilities, provider) per model id
+        self._parse_cache: Dict[
+            str,
+            Tuple[
+                Optional[str],
+                str,
+                FrozenSet[ModelCapability],
+                Optional[LLMProvider],
+            ],
+        ] = {}
 
     def register_provider(self, prefix: str, provider: LLMProvider):
         """Register an LLM provider with the factory.
@@ -20,72 +106,83 @@ class LLMFactory:
         Args:
             prefix: Provider prefix used in model names (e.g., 'bedrock')
             provider: LLMProvider instance
+
+        Raises:
+            ValueError: If a provider is already registered under the prefix
         """
+        prefix = self._add_prefix(prefix)
         self._providers[prefix] = provider
 
+    def register_lazy_provider(self, prefix: str, loader: Callable[[], LLMProvider]):
+        """Register a provider that is only created when first needed.
+
+        Args:
+            prefix: Provider prefix used in model names (e.g., 'bedrock')
+            loader: Callable returning the LLMProvider instance
+
+        Raises:
+            ValueError: If a provider is already registered under the prefix
+        """
+        prefix = self._add_prefix(prefix)
+        self._provider_loaders[prefix] = loader
+
+    def _add_prefix(self, prefix: str) -> str:
+        """Reserve a provider prefix and rebuild the dispatch pattern."""
+        if prefix in self._prefixes:
+            raise ValueError(f"Duplicate provider registration: {prefix}")
+        prefix = sys.intern(prefix)
+        self._prefixes.append(prefix)
+        self._dispatch_re = re.compile(
+            r"\((" + "|".join(re.escape(p) for p in self._prefixes) + r")\)"
+        )
+        self._parse_cache.clear()
+        return prefix
+
+    def _get_provider(self, prefix: str) -> LLMProvider:
+        """Get the provider registered under a prefix, loading it if needed."""
+        provider = self._providers.get(prefix)
+        if provider is None:
+            with self._provider_lock:
+                provider = self._providers.get(prefix)
+                if provider is None:
+                    provider = self._provider_loaders[prefix]()
+                    self._providers[prefix] = provider
+                    del self._provider_loaders[prefix]
+        return provider
+
     def _get_llm_cache_key(
         self,
         model_name: str,
         **kwargs,
-    ) -> str:
+    ) -> Tuple:
         """Generate unique cache key for LLM instance.
 
         Args:
-            model_name: Name of the model
+            model_name: Full model identifier, including the provider prefix
             **kwargs: Model parameters that affect caching including:
                 - temperature: Temperature setting (0.0-1.0)
                 - enable_prompt_cache: Whether prompt caching is enabled
                 - reasoning_config: Config for reasoning capabilities
 
         Returns:
-            str: Cache key for the LLM instance
+            Tuple: Hashable cache key for the LLM instance
         """
-        # Start with the model name as base key
-        key = model_name
-
-        # Handle common parameters with defaults
-        temperature = kwargs.get("temperature", 0.6)
-        rounded_temp = round(
-            float(temperature), 1
-        )  # Round to 1 decimal place for caching
-        key = f"{key}:temp_{rounded_temp}"
-
-        enable_prompt_cache = kwargs.get("enable_prompt_cache", False)
-        key = f"{key}:cache_{enable_prompt_cache}"
-
-        # Special handling for reasoning_config
-        reasoning_config = kwargs.get("reasoning_config", None)
-        if reasoning_config:
-            if hasattr(reasoning_config, "budget_tokens"):
-                key = f"{key}:reasoning:{reasoning_config.budget_tokens}"
-            elif (
-                isinstance(reasoning_config, dict)
-                and "budget_tokens" in reasoning_config
-            ):
-                key = f"{key}:reasoning:{reasoning_config['budget_tokens']}"
-
-        # Add any other relevant kwargs that would affect model behavior
-        # Skip already processed keys and any keys that shouldn't affect caching
-        skip_keys = {
-            "temperature",
-            "enable_prompt_cache",
-            "reasoning_config",
-            "name",
-            "model",
-            "tools",
-        }
-        for k, v in sorted(kwargs.items()):  # Sort for consistent order
-            if k not in skip_keys and v is not None:
-                # Convert complex values to a simple string representation
-                if (
-                    isinstance(v, bool)
-                    or isinstance(v, int)
-                    or isinstance(v, float)
-                    or isinstance(v, str)
-                ):
-                    key = f"{key}:{k}_{v}"
-
-        return key
+        # Fast path: nothing to inspect when only defaults apply
+        if not kwargs:
+            return (model_name, _DEFAULT_CACHE_PARAMS, _NO_EXTRA_KWARGS)
+
+        params = _extract_cache_params(kwargs)
+
+        # Add any other relevant kwargs that would affect model behavior.
+        # A frozenset compares and hashes independently of kwarg order,
+        # so the items never need sorting.
+        extra = frozenset(
+            (k, v)
+            for k, v in kwargs.items()
+            if k not in _CACHE_KEY_SKIP and isinstance(v, _SCALAR_TYPES)
+        )
+
+        return (model_name, params, extra)
 
     def create_model(
         self, name: str, model: str, tools: Optional[List] = None, **kwargs
@@ -107,58 +204,73 @@ class LLMFactory:
         Raises:
             ValueError: If no provider is found for the given model
         """
+        # Generate cache key from the full model id and check for a cached
+        # instance first, so hits skip parsing and capability lookups
+        cache_key = self._get_llm_cache_key(model, **kwargs)
+
+        # Return cached instance if available
+        if cache_key in self._llm_cache:
+            logging.debug(f"Using cached LLM instance: {cache_key}")
+            self._llm_cache.move_to_end(cache_key)
+            return self._llm_cache[cache_key]
+
         # Extract provider and model name
-        provider_name, model_name, capabilities = self._parse_model_id(model)
+        provider_name, model_name, capabilities, provider = self._parse_model_id(model)
         if not provider_name:
             raise ValueError(f"No provider found for model: {model}")
 
-        provider = self._providers[provider_name]
-
         # Determine if model supports tools
         supports_tools = ModelCapability.TOOL_CALLING in capabilities
 
-        # Generate cache key and check for cached instance
-        cache_key = self._get_llm_cache_key(model_name, **kwargs)
-
-        # Return cached instance if available
-        if cache_key in self._llm_cache:
-            logging.debug(f"Using cached LLM instance: {cache_key}")
-            return self._llm_cache[cache_key]
-
         # Create model with appropriate parameters
         if supports_tools and tools:
             model_instance = provider.create_model(
                 name, model_name, tools=tools, **kwargs
             )
         else:
-            if tools is not None and tools != [] and not supports_tools:
+            if tools and not supports_tools:
                 logging.debug(f"Model {model_name} does not support tool calling")
             model_instance = provider.create_model(name, model_name, **kwargs)
 
-        # Cache the new instance
+        # Cache the new instance, evicting the least recently used one if full
         self._llm_cache[cache_key] = model_instance
+        if len(self._llm_cache) > self._llm_cache_maxsize:
+            self._llm_cache.popitem(last=False)
         return model_instance
 
     def _parse_model_id(
         self, model: str
-    ) -> Tuple[Optional[str], str, Set[ModelCapability]]:
+    ) -> Tuple[Optional[str], str, FrozenSet[ModelCapability], Optional[LLMProvider]]:
         """Parse a model identifier into provider, model name, and capabilities.
 
         Args:
             model: Full model identifier with provider prefix
 
         Returns:
-            Tuple of (provider_name, model_name, capabilities)
+            Tuple of (provider_name, model_name, capabilities, provider)
         """
-        for provider_name, provider in self._providers.items():
-            prefix = f"({provider_name})"
-            if model.startswith(prefix):
-                model_name = model.replace(prefix, "")
-                capabilities = provider.capabilities.get(model_name, set())
-                return provider_name, model_name, capabilities
-        return None, model, set()
-
-    def get_model_capabilities(self, model: str) -> Set[ModelCapability]:
+        parsed = self._parse_cache.get(model)
+        if parsed is not None:
+            return parsed
+
+        match = self._dispatch_re.match(model) if self._dispatch_re else None
+        if not match:
+            return None, model, _EMPTY_CAPS, None
+
+        provider_name = match.group(1)
+        model_name = model[match.end() :]
+        provider = self._get_provider(provider_name)
+        # frozenset() of an already frozen set is free, so providers may
+        # return either mutable sets or frozensets
+        capabilities = frozenset(provider.capabilities.get(model_name, _EMPTY_CAPS))
+        parsed = (provider_name, model_name, capabilities, provider)
+        # Empty capabilities may just mean the provider is unreachable right now
+        # (e.g. Ollama), so only remember lookups that resolved the model
+        if capabilities:
+            self._parse_cache[model] = parsed
+        return parsed
+
+    def get_model_capabilities(self, model: str) -> FrozenSet[ModelCapability]:
         """Get capabilities for a specific model.
 
         Args:
@@ -167,8 +279,7 @@ class LLMFactory:
         Returns:
             Set of ModelCapability values supported by the model
         """
-        _, _, capabilities = self._parse_model_id(model)
-        return capabilities
+        return self._parse_model_id(model)[2]
 
     def list_models(
         self, capabilities: Optional[set[ModelCapability]] = None
@@ -179,38 +290,43 @@ class LLMFactory:
             capabilities: Optional set of capabilities to filter models by
 
         Returns:
-            List of model identifiers with provider prefixes
+            List of model identifiers with provider prefixes. The identifiers
+            are interned, since they are fed back as cache and lookup keys.
         """
         models = []
-        for provider in self._providers.values():
+        required = frozenset(capabilities) if capabilities else None
+        for provider_name in self._prefixes:
             try:
+                provider = self._get_provider(provider_name)
                 provider_models = provider.list_models()
-                if capabilities:
+                prefix = f"({provider.name})"
+                if required is None:
                     models.extend(
                         [
-                            f"({provider.name}){model_name}"
-                            for model_name in provider_models
-                            if all(
-                                cap in provider.capabilities.get(model_name, set())
-                                for cap in capabilities
-                            )
-                        ]
-                    )
-                else:
-                    models.extend(
-                        [
-                            f"({provider.name}){model_name}"
+                            sys.intern(prefix + model_name)
                             for model_name in provider_models
                         ]
                     )
+                    continue
+
+                # Resolve the capability map once per provider, not per model
+                caps_map = provider.capabilities
+                models.extend(
+                    [
+                        sys.intern(prefix + model_name)
+                        for model_name in provider_models
+                        if required.issubset(caps_map.get(model_name, _EMPTY_CAPS))
+                    ]
+                )
             except Exception as e:
                 logging.warning(
-                    f"Failed to list models for provider {provider.name}: {e}"
+                    f"Failed to list models for provider {provider_name}: {e}"
                 )
                 continue
         return models
 
     def clear_cache(self) -> None:
-        """Clear the LLM instance cache."""
+        """Clear the LLM instance cache and parsed model ids."""
         self._llm_cache.clear()
+        self._parse_cache.clear()
         logging.debug("LLM instance cache cleared")
@@ -1,7 +1,24 @@
 """LLM providers for Aki."""
 
+import importlib
+
 from .base import LLMProvider, LLMModel
-from .bedrock import BedrockProvider
-from .ollama import OllamaProvider
+
+# Concrete providers pull in heavy SDKs (boto3, ollama), so they are only
+# imported on first attribute access
+_LAZY_PROVIDERS = {
+    "BedrockProvider": ".bedrock",
+    "OllamaProvider": ".ollama",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_PROVIDERS:
+        module = importlib.import_module(_LAZY_PROVIDERS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = ["LLMProvider", "LLMModel", "BedrockProvider", "OllamaProvider"]
@@ -1,11 +1,11 @@
-from abc import ABC
+from abc import ABC, abstractmethod
 from typing import Optional, Dict, List
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.messages import AnyMessage
 from langchain_core.messages import trim_messages
 
 from ..capabilities import ModelCapability
-from ..token_counter import tiktoken_counter
+from ..token_counter import max_token_estimate, tiktoken_counter
 
 
 class LLMModel(BaseChatModel):
@@ -27,6 +27,7 @@ class LLMModel(BaseChatModel):
 class LLMProvider(ABC):
     """Abstract base class for LLM providers."""
 
+    @abstractmethod
     def create_model(
         self, name: str, model: str, tools: Optional[List] = None, **kwargs
     ) -> LLMModel:
@@ -41,8 +42,8 @@ class LLMProvider(ABC):
         Returns:
             LLMModel: The created model instance
         """
-        pass
 
+    @abstractmethod
     def list_models(
         self, capabilities: Optional[set[ModelCapability]] = None
     ) -> List[str]:
@@ -54,7 +55,6 @@ class LLMProvider(ABC):
         Returns:
             List of model identifiers
         """
-        pass
 
     def filter_messages(
         self, messages: List[AnyMessage], max_tokens: int = 100000
@@ -68,17 +68,21 @@ class LLMProvider(ABC):
         Returns:
             List of filtered messages
         """
+        # Skip tokenizing when even the worst-case estimate fits
+        if max_token_estimate(messages) <= max_tokens:
+            return list(messages)
+
         # Default implementation: trim messages to max tokens
         return trim_messages(
             messages, max_tokens=max_tokens, token_counter=tiktoken_counter
         )
 
     @property
+    @abstractmethod
     def name(self) -> str:
         """The name of this provider."""
-        raise NotImplementedError
 
     @property
+    @abstractmethod
     def capabilities(self) -> Dict[str, set[ModelCapability]]:
         """Map of model names to their capabilities."""
-        raise NotImplementedError
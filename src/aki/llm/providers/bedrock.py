@@ -1,284 +1,250 @@
 """Amazon Bedrock provider for Aki."""
 
+import hashlib
+import importlib
 import logging
-import boto3
+import threading
+import time
 import json
-from typing import Dict, List, Optional, Set, Any, Tuple, Iterator
-from botocore.client import BaseClient, Config
-
-from langchain_aws import ChatBedrockConverse
-from langchain_aws.chat_models.bedrock_converse import (
-    _messages_to_bedrock,
-    _snake_to_camel_keys,
-    _parse_response,
-    _parse_stream_event,
-)
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, FrozenSet, List, Optional, Any, Tuple
+
 from langchain_core.language_models.chat_models import BaseChatModel
-from langchain_core.messages import BaseMessage
-from langchain_core.outputs import ChatResult, ChatGeneration, ChatGenerationChunk
 
 from ...config import get_env_file, get_config_value
 from ..capabilities import ModelCapability
 from .base import LLMProvider
-from .. import token_counter
+
+# boto3 and langchain_aws take a while to import, so they are only loaded
+# once Bedrock is actually used; processes that never create a Bedrock model
+# don't pay for them
+if TYPE_CHECKING:
+    import boto3
+    from botocore.client import BaseClient, Config
 
 logger = logging.getLogger(__name__)
 
+# Chat model classes imported on first attribute access
+_LAZY_ATTRIBUTES = {
+    "ChatBedrockConverse": "langchain_aws",
+    "CachingBedrockConverse": "aki.llm.providers.bedrock_converse",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(_LAZY_ATTRIBUTES[name])
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Only this provider's models are listed when checking Bedrock access
+_VALIDATION_PROVIDER = "anthropic"
+# Seconds a successful access check is trusted across processes
+_VALIDATION_TTL = 60 * 60
+# PBKDF2 rounds used to hash the secret key into a validation fingerprint
+_FINGERPRINT_ITERATIONS = 100_000
+# Error codes meaning the credentials themselves are no longer accepted
+_AUTH_ERROR_CODES = frozenset(
+    {
+        "AccessDeniedException",
+        "ExpiredTokenException",
+        "InvalidSignatureException",
+        "UnrecognizedClientException",
+    }
+)
 
-class CachePointInjector:
-    """Helper to inject cache points into messages for Bedrock models."""
+# Validated sessions per (access_key, secret_key, profile) and bedrock-runtime
+# clients per (access_key, secret_key, profile, region), shared by all providers
+_session_cache: Dict[Tuple[Optional[str], ...], "boto3.Session"] = {}
+_runtime_client_cache: Dict[Tuple[Optional[str], ...], "BaseClient"] = {}
+# boto3 sessions aren't thread-safe, so sessions and clients are only created
+# under this lock; the resulting clients are safe to share
+_client_cache_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _region() -> str:
+    """Get the AWS region for Bedrock clients, read once."""
+    return get_config_value("AWS_DEFAULT_REGION", "us-west-2")
+
+
+@lru_cache(maxsize=1)
+def _env_file_path() -> Path:
+    """Get the path of the ~/.aki/.env file, resolved once."""
+    return get_env_file()
+
+
+@lru_cache(maxsize=1)
+def _client_config() -> "Config":
+    """Get the botocore config shared by all bedrock-runtime clients."""
+    from botocore.client import Config
+
+    return Config(
+        read_timeout=20000,
+        connect_timeout=20000,
+        # 5 retries after the initial request
+        retries={"total_max_attempts": 6, "mode": "adaptive"},
+        # botocore's default pool of 10 serializes concurrent model calls
+        max_pool_connections=int(
+            get_config_value("BEDROCK_MAX_POOL_CONNECTIONS", "1000")
+        ),
+        # Keep idle pooled connections from being dropped by NAT/VPN timeouts
+        tcp_keepalive=get_config_value("BEDROCK_TCP_KEEPALIVE", "true").lower()
+        == "true",
+        user_agent_extra="aki/bedrock",
+    )
 
-    @staticmethod
-    def add_cache_point_to_messages(
-        messages: List[Dict], system: List[Dict], max_cache_points: int = 3
-    ) -> tuple:
-        """Add cachePoint to system prompt and last 2 user messages.
 
-        Args:
-            messages: List of message dictionaries from Bedrock
-            system: Optional system message (string or dict)
-            max_cache_points: Maximum number of cache points to add (default: 3, ignored)
+def _validation_marker_path() -> Path:
+    """Get the file recording recent successful Bedrock access checks."""
+    return _env_file_path().parent / ".bedrock_validated"
 
-        Returns:
-            Tuple of (modified messages list, modified system)
-        """
-        # Cache point indices to track which messages get cache points
-        cache_indices = set()
-
-        # 1. Always add a cache point to the system message if it exists
-        modified_system = system
-        if len(system) > 0:
-            if "cachePoint" not in modified_system:
-                modified_system.append({"cachePoint": {"type": "default"}})
-            logger.debug("Added cache point to system message")
-
-        # 2. Find the last 2 user messages and mark them for cache points
-        user_message_indices = []
-        for i, msg in enumerate(messages):
-            role = msg.get("role", "")
-            if role == "user":
-                user_message_indices.append(i)
-
-        # Get the last 2 user message indices (or all if less than 2)
-        last_user_indices = (
-            user_message_indices[-2:]
-            if len(user_message_indices) > 1
-            else user_message_indices
-        )
 
-        # Add these indices to our cache set
-        for idx in last_user_indices:
-            cache_indices.add(idx)
-            logger.debug(f"Marked user message at index {idx} for cache point")
-
-        # 3. Process all messages, adding cache points to the selected indices
-        result = []
-        for i, msg in enumerate(messages):
-            new_msg = dict(msg)  # Create a copy
-
-            # Add cache point if this message was selected
-            if i in cache_indices:
-                new_msg = CachePointInjector._add_cache_point(new_msg)
-                logger.debug(
-                    f"Added cache point to message with role: {new_msg.get('role', 'unknown')}"
-                )
+def _credential_fingerprint(
+    access_key: Optional[str], secret_key: Optional[str], profile: Optional[str]
+) -> str:
+    """Identify a credential source by its profile, or its access key and secret.
 
-            result.append(new_msg)
+    The secret only enters as a PBKDF2 hash salted with the access key ID, so a
+    rotated or mistyped secret gets a new fingerprint without the secret itself
+    being recoverable from the marker file.
+    """
+    if profile:
+        return f"profile:{profile}"
+    digest = hashlib.pbkdf2_hmac(
+        "sha256",
+        (secret_key or "").encode(),
+        f"aki-bedrock:{access_key}".encode(),
+        _FINGERPRINT_ITERATIONS,
+    )
+    return f"key:{access_key}:{digest.hex()}"
 
-        return result, modified_system
 
-    @staticmethod
-    def _estimate_token_size(msg: Dict) -> int:
-        """Estimate token size of a message."""
-        # Extract the content - handle different formats
-        if "content" not in msg:
-            if "text" in msg:
-                content = msg["text"]
-            else:
-                return 0
-        else:
-            content = msg["content"]
-
-        # If content is a string, count tokens directly
-        if isinstance(content, str):
-            return token_counter.str_token_counter(content)
-
-        # If content is a list of content blocks, sum up their sizes
-        elif isinstance(content, list):
-            total = 0
-            for item in content:
-                if isinstance(item, dict) and "text" in item:
-                    total += token_counter.str_token_counter(item["text"])
-                elif isinstance(item, dict):
-                    # For non-text blocks, estimate based on JSON representation
-                    total += token_counter.str_token_counter(json.dumps(item))
-                elif isinstance(item, str):
-                    total += token_counter.str_token_counter(item)
-            return total
-
-        # Default fallback - convert to string and count
-        return token_counter.str_token_counter(json.dumps(content))
-
-    @staticmethod
-    def _add_cache_point(msg: Dict) -> Dict:
-        """Add a cache point to a single message."""
-        # Make a deep copy
-        new_msg = dict(msg)
-
-        # Handle different content formats
-        if "content" not in new_msg:
-            new_msg["content"] = []
-        elif isinstance(new_msg["content"], str):
-            # Convert string content to list with text item
-            new_msg["content"] = [{"text": new_msg["content"]}]
-        elif not isinstance(new_msg["content"], list):
-            # Convert other content to list
-            new_msg["content"] = [new_msg["content"]]
-
-        # Add cache point if not already present
-        content_list = new_msg["content"]
-        cache_point = {"cachePoint": {"type": "default"}}
-
-        # Only add if not already present
-        if not any(
-            isinstance(item, dict) and "cachePoint" in item for item in content_list
-        ):
-            content_list.append(cache_point)
-
-        # Print debug info
-        logger.debug(
-            f"Added cache point to message with role: {new_msg.get('role', 'unknown')}"
-        )
+def _recently_validated(fingerprint: str) -> bool:
+    """Check whether a credential source passed validation in this region lately."""
+    try:
+        entry = json.loads(_validation_marker_path().read_text()).get(fingerprint)
+    except (OSError, ValueError, AttributeError):
+        return False
+    return (
+        isinstance(entry, dict)
+        and entry.get("region") == _region()
+        and time.time() - entry.get("timestamp", 0) < _VALIDATION_TTL
+    )
+
 
-        return new_msg
+def _record_validation(fingerprint: str) -> None:
+    """Remember that a credential source passed validation."""
+    path = _validation_marker_path()
+    try:
+        try:
+            entries = json.loads(path.read_text())
+            if not isinstance(entries, dict):
+                entries = {}
+        except (OSError, ValueError):
+            entries = {}
+        now = time.time()
+        # Drop expired checks, e.g. those of keys that have since been rotated
+        entries = {
+            key: entry
+            for key, entry in entries.items()
+            if isinstance(entry, dict)
+            and now - entry.get("timestamp", 0) < _VALIDATION_TTL
+        }
+        entries[fingerprint] = {"region": _region(), "timestamp": now}
+        path.write_text(json.dumps(entries))
+    except OSError as e:
+        logger.debug("Could not record Bedrock validation: %s", e)
 
 
-class CachingBedrockConverse(ChatBedrockConverse):
-    """ChatBedrockConverse with prompt caching support."""
+def _forget_validation(fingerprint: str) -> None:
+    """Drop a credential source's recorded check so the next use re-validates."""
+    path = _validation_marker_path()
+    try:
+        entries = json.loads(path.read_text())
+        if isinstance(entries, dict) and entries.pop(fingerprint, None) is not None:
+            path.write_text(json.dumps(entries))
+    except (OSError, ValueError) as e:
+        logger.debug("Could not forget Bedrock validation: %s", e)
+
+
+def _reset_caches() -> None:
+    """Forget cached configuration, sessions and clients (e.g. between tests)."""
+    _region.cache_clear()
+    _env_file_path.cache_clear()
+    _client_config.cache_clear()
+    _session_cache.clear()
+    _runtime_client_cache.clear()
+
+
+# Modules of the HTTP stack whose assertion errors mean a broken connection
+_HTTP_STACK_MODULES = ("urllib3", "botocore", "boto3")
+
+# Capabilities of each supported model
+_CAPABILITIES: Dict[str, FrozenSet[ModelCapability]] = {
+    "us.anthropic.claude-3-7-sonnet-20250219-v1:0": frozenset(
+        {
+            ModelCapability.TEXT_TO_TEXT,
+            ModelCapability.IMAGE_TO_TEXT,
+            ModelCapability.TOOL_CALLING,
+            ModelCapability.STRUCTURED_OUTPUT,
+            ModelCapability.EXTENDED_REASONING,
+            ModelCapability.PROMPT_CACHING,
+        }
+    ),
+    "us.anthropic.claude-3-5-sonnet-20241022-v2:0": frozenset(
+        {
+            ModelCapability.TEXT_TO_TEXT,
+            ModelCapability.IMAGE_TO_TEXT,
+            ModelCapability.TOOL_CALLING,
+            ModelCapability.STRUCTURED_OUTPUT,
+        }
+    ),
+    "us.anthropic.claude-3-5-haiku-20241022-v1:0": frozenset(
+        {
+            ModelCapability.TEXT_TO_TEXT,
+            ModelCapability.IMAGE_TO_TEXT,
+            ModelCapability.TOOL_CALLING,
+            ModelCapability.STRUCTURED_OUTPUT,
+            ModelCapability.PROMPT_CACHING,
+        }
+    ),
+    "us.anthropic.claude-3-5-sonnet-20240620-v1:0": frozenset(
+        {
+            ModelCapability.TEXT_TO_TEXT,
+            ModelCapability.IMAGE_TO_TEXT,
+            ModelCapability.TOOL_CALLING,
+            ModelCapability.STRUCTURED_OUTPUT,
+        }
+    ),
+    "stability.stable-image-ultra-v1:0": frozenset({ModelCapability.TEXT_TO_IMAGE}),
+    "stability.stable-image-core-v1:0": frozenset({ModelCapability.TEXT_TO_IMAGE}),
+    "us.deepseek.r1-v1:0": frozenset({ModelCapability.TEXT_TO_TEXT}),
+}
 
-    max_cache_points: int = 3  # Properly declare field for Pydantic model
 
-    def __init__(self, **kwargs):
-        """Initialize with caching configuration.
+def _models_with(capability: ModelCapability) -> FrozenSet[str]:
+    """Get the IDs of all models supporting a capability."""
+    return frozenset(m for m, caps in _CAPABILITIES.items() if capability in caps)
 
-        Args:
-            max_cache_points: Maximum number of cache points to add (default: 3)
-            All other kwargs are passed to the parent class
-        """
-        # Get max_cache_points to pass to parent class init
-        max_points = kwargs.pop("max_cache_points", 3)
-        super().__init__(**kwargs)
-        # Set the field after parent initialization
-        object.__setattr__(self, "max_cache_points", max_points)
-
-    def _converse_params(
-        self,
-        **kwargs: Any,
-    ) -> Dict[str, Any]:
-        """Override _converse_params to add cache points to tools configuration."""
-        # First get the parameters from the parent class
-        params = super()._converse_params(**kwargs)
-
-        # Add cache point to toolConfig if present
-        if "toolConfig" in params and params["toolConfig"] is not None:
-            tool_config = params["toolConfig"]
-            if "tools" in tool_config and tool_config["tools"] is not None:
-                tools_list = tool_config["tools"]
-                # Check if there's already a cache point
-                has_cache_point = any(
-                    isinstance(tool, dict) and "cachePoint" in tool
-                    for tool in tools_list
-                )
-                # Add cache point if needed
-                if not has_cache_point:
-                    logger.debug("Adding cache point to tools configuration")
-                    tools_list.append({"cachePoint": {"type": "default"}})
-
-        return params
-
-    def _generate(
-        self,
-        messages: List[BaseMessage],
-        stop: Optional[List[str]] = None,
-        run_manager=None,
-        **kwargs: Any,
-    ) -> ChatResult:
-        """Override _generate to add cache points to messages."""
-        # Get bedrock messages using the original function
-        bedrock_messages, system = _messages_to_bedrock(messages)
-
-        # Inject cache points to both regular messages and system
-        bedrock_messages, system = CachePointInjector.add_cache_point_to_messages(
-            bedrock_messages, system=system, max_cache_points=self.max_cache_points
-        )
 
-        # Continue with regular process - similar to parent class
-        logger.debug(f"input message to bedrock: {bedrock_messages}")
-        logger.debug(f"System message to bedrock: {system}")
-        params = self._converse_params(
-            stop=stop,
-            **_snake_to_camel_keys(
-                kwargs, excluded_keys={"inputSchema", "properties", "thinking"}
-            ),
-        )
-        logger.debug(f"Input params: {params}")
-        logger.info(
-            "Using Bedrock Converse API to generate response with caching enabled"
-        )
-        response = self.client.converse(
-            messages=bedrock_messages, system=system, **params
-        )
-        logger.debug(f"Response from Bedrock: {response}")
-        response_message = _parse_response(response)
-        response_message.response_metadata["model_name"] = self.model_id
-        return ChatResult(generations=[ChatGeneration(message=response_message)])
-
-    def _stream(
-        self,
-        messages: List[BaseMessage],
-        stop: Optional[List[str]] = None,
-        run_manager=None,
-        **kwargs: Any,
-    ) -> Iterator[ChatGenerationChunk]:
-        """Override _stream to add cache points to messages."""
-        # Get bedrock messages using the original function
-        bedrock_messages, system = _messages_to_bedrock(messages)
-
-        # Inject cache points to both regular messages and system
-        bedrock_messages, system = CachePointInjector.add_cache_point_to_messages(
-            bedrock_messages, system=system, max_cache_points=self.max_cache_points
-        )
+_REASONING_MODELS = _models_with(ModelCapability.EXTENDED_REASONING)
+_TOOL_MODELS = _models_with(ModelCapability.TOOL_CALLING)
+_CACHING_MODELS = _models_with(ModelCapability.PROMPT_CACHING)
+# Beta features requested alongside extended reasoning; each config gets its
+# own list built from this template
+_REASONING_BETA_FEATURES = ("token-efficient-tools-2025-02-19",)
 
-        # Continue with regular process - similar to parent class
-        params = self._converse_params(
-            stop=stop,
-            **_snake_to_camel_keys(
-                kwargs, excluded_keys={"inputSchema", "properties", "thinking"}
-            ),
-        )
-        response = self.client.converse_stream(
-            messages=bedrock_messages, system=system, **params
-        )
-        added_model_name = False
-        for event in response["stream"]:
-            if message_chunk := _parse_stream_event(event):
-                if (
-                    hasattr(message_chunk, "usage_metadata")
-                    and message_chunk.usage_metadata
-                    and not added_model_name
-                ):
-                    message_chunk.response_metadata["model_name"] = self.model_id
-                    added_model_name = True
-                generation_chunk = ChatGenerationChunk(message=message_chunk)
-                if run_manager:
-                    run_manager.on_llm_new_token(
-                        generation_chunk.text, chunk=generation_chunk
-                    )
-                yield generation_chunk
 
+def validate_bedrock_access(session: "boto3.Session") -> bool:
+    """Validate Bedrock access by listing one provider's foundation models.
 
-def validate_bedrock_access(session: boto3.Session) -> bool:
-    """Validate Bedrock access by attempting to list foundation models.
+    Filtering by provider keeps the response to a handful of records instead
+    of the whole catalog, without depending on any one model being offered.
 
     Args:
         session: boto3.Session to validate
@@ -288,23 +254,23 @@ def validate_bedrock_access(session: boto3.Session) -> bool:
     """
     try:
         # Get region from environment or use default
-        region = get_config_value("AWS_DEFAULT_REGION", "us-west-2")
-        client = session.client("bedrock", region_name=region)
-        response = client.list_foundation_models()
-        models = response["modelSummaries"]
-        # TODO: need to verify models that we use
-        logger.debug(
-            f"Successfully validated Bedrock access. Found {len(models)} foundation models."
-        )
+        client = session.client("bedrock", region_name=_region())
+        client.list_foundation_models(byProvider=_VALIDATION_PROVIDER)
+        logger.debug("Successfully validated Bedrock access")
         return True
     except Exception as e:
-        logger.debug(f"Bedrock access validation failed: {str(e)}")
+        logger.debug("Bedrock access validation failed: %s", e)
         return False
 
 
-def create_session_from_env(env_vars: dict) -> Tuple[Optional[boto3.Session], str]:
+def create_session_from_env(
+    env_vars: dict,
+) -> Tuple[Optional["boto3.Session"], str]:
     """Create a boto3 session from environment variables.
 
+    The session is shared with BedrockProvider, so validating credentials here
+    means a provider using the same credentials skips the check.
+
     Args:
         env_vars: Dictionary containing AWS credentials
 
@@ -317,73 +283,196 @@ def create_session_from_env(env_vars: dict) -> Tuple[Optional[boto3.Session], st
     if not aws_access_key or not aws_secret_key:
         return None, "Missing required AWS credentials"
 
-    session = boto3.Session(
-        aws_access_key_id=aws_access_key, aws_secret_access_key=aws_secret_key
-    )
+    with _client_cache_lock:
+        session = _get_cached_session(aws_access_key, aws_secret_key, None)
 
-    if validate_bedrock_access(session):
+    if session is not None:
         return session, "Successfully validated credentials"
     return None, "Failed to validate Bedrock access"
 
 
+def _get_cached_session(
+    access_key: Optional[str],
+    secret_key: Optional[str],
+    profile: Optional[str],
+    validate: bool = True,
+) -> Optional["boto3.Session"]:
+    """Create and optionally validate a boto3 session once per credential source.
+
+    Sessions are shared by all BedrockProvider instances, so the credential
+    chain and Bedrock access check only run on first use. Successful
+    checks are also recorded in ~/.aki/.bedrock_validated and trusted for an
+    hour by later processes, or until BedrockProvider.invalidate_client is
+    called for an auth error. Failed validations are not remembered, as the
+    credentials may be fixed later.
+
+    Args:
+        access_key: AWS access key ID, or None when using a profile
+        secret_key: AWS secret access key, or None when using a profile
+        profile: AWS profile name, or None when using explicit keys
+        validate: Whether to check Bedrock access before using the session
+
+    Returns:
+        Optional[boto3.Session]: The validated session, or None if validation failed
+    """
+    key = (access_key, secret_key, profile)
+    session = _session_cache.get(key)
+    if session is not None:
+        return session
+
+    import boto3
+
+    if profile:
+        session = boto3.Session(profile_name=profile)
+    else:
+        session = boto3.Session(
+            aws_access_key_id=access_key, aws_secret_access_key=secret_key
+        )
+    if validate:
+        fingerprint = _credential_fingerprint(access_key, secret_key, profile)
+        if _recently_validated(fingerprint):
+            logger.debug("Skipping Bedrock access check, validated recently")
+        elif validate_bedrock_access(session):
+            _record_validation(fingerprint)
+        else:
+            return None
+    _session_cache[key] = session
+    return session
+
+
+def _get_cached_runtime_client(
+    access_key: Optional[str],
+    secret_key: Optional[str],
+    profile: Optional[str],
+    region: str,
+    validate: bool = True,
+) -> Optional["BaseClient"]:
+    """Get a shared bedrock-runtime client for a credential source and region.
+
+    Reusing the client keeps its connection pool alive across providers.
+
+    Args:
+        access_key: AWS access key ID, or None when using a profile
+        secret_key: AWS secret access key, or None when using a profile
+        profile: AWS profile name, or None when using explicit keys
+        region: AWS region of the client
+        validate: Whether to check Bedrock access before creating the client
+
+    Returns:
+        Optional[BaseClient]: The client, or None if the credentials are invalid
+    """
+    key = (access_key, secret_key, profile, region)
+    client = _runtime_client_cache.get(key)
+    if client is not None:
+        return client
+
+    with _client_cache_lock:
+        # Another thread may have created the client while we waited
+        client = _runtime_client_cache.get(key)
+        if client is not None:
+            return client
+
+        session = _get_cached_session(access_key, secret_key, profile, validate)
+        if session is None:
+            return None
+        client = session.client(
+            "bedrock-runtime", region_name=region, config=_client_config()
+        )
+        _runtime_client_cache[key] = client
+        return client
+
+
+def is_auth_error(exc: BaseException) -> bool:
+    """Check whether an exception means Bedrock rejected the credentials.
+
+    Args:
+        exc: Exception raised by a Bedrock call
+
+    Returns:
+        bool: True if the credentials should be validated again before reuse
+    """
+    from botocore.exceptions import ClientError
+
+    if not isinstance(exc, ClientError):
+        return False
+    return exc.response.get("Error", {}).get("Code") in _AUTH_ERROR_CODES
+
+
+def is_stale_connection_error(exc: BaseException) -> bool:
+    """Check whether an exception means the client's connections are stale.
+
+    Args:
+        exc: Exception raised by a Bedrock call
+
+    Returns:
+        bool: True if the client should be discarded and recreated
+    """
+    # Errors that mean a pooled connection has gone stale (e.g. dropped by a
+    # NAT or VPN idle timeout) rather than a problem with the request itself
+    from botocore.exceptions import ConnectionError as BotocoreConnectionError
+    from botocore.exceptions import HTTPClientError
+    from urllib3.exceptions import ProtocolError
+
+    if isinstance(exc, (HTTPClientError, BotocoreConnectionError, ProtocolError)):
+        return True
+    if isinstance(exc, AssertionError):
+        # urllib3 asserts on connections left in a bad state
+        tb = exc.__traceback__
+        if tb is None:
+            return False
+        while tb.tb_next is not None:
+            tb = tb.tb_next
+        module = tb.tb_frame.f_globals.get("__name__", "")
+        return module.split(".", 1)[0] in _HTTP_STACK_MODULES
+    return False
+
+
 class BedrockProvider(LLMProvider):
     """Provider for Amazon Bedrock models."""
 
     def __init__(self):
-        self._model_capabilities = self.capabilities
+        self._model_capabilities = _CAPABILITIES
         self._logger = logging.getLogger(__name__)
         self._client = None
+        self._client_lock = threading.Lock()
 
-    def _create_client(self) -> BaseClient:
+    def _create_client(self) -> "BaseClient":
         """Create a Bedrock client with credential discovery.
 
         Attempts to create a client using credentials in the following order:
         1. Credentials from ~/.aki/.env file
         2. AWS profile 'aki' (if it exists)
 
+        Bedrock access is only checked up front for the .env credentials, since
+        the profile is there to fall back on. The profile is the last option,
+        so it is used without the extra access-check round-trip and
+        invalid credentials surface from the first model call instead.
+
         Returns:
             BaseClient: A configured boto3 bedrock-runtime client
         """
         try:
             # Get region from environment with fallback to default
-            region = get_config_value("AWS_DEFAULT_REGION", "us-west-2")
-            logger.debug(f"Using AWS region: {region}")
-
-            config_obj = Config(
-                read_timeout=20000,
-                connect_timeout=20000,
-                retries={"max_attempts": 5, "mode": "adaptive"},
-            )
+            region = _region()
+            logger.debug("Using AWS region: %s", region)
 
             # 1. Try loading credentials from ~/.aki/.env
             logger.debug("Attempting to use credentials from ~/.aki/.env")
-            env_path = get_env_file()
+            env_path = _env_file_path()
             if env_path.exists():
                 try:
-                    # Load credentials from env file
-                    env_vars = {
-                        "AWS_ACCESS_KEY_ID": get_config_value("AWS_ACCESS_KEY_ID"),
-                        "AWS_SECRET_ACCESS_KEY": get_config_value(
-                            "AWS_SECRET_ACCESS_KEY"
-                        ),
-                    }
-
-                    if (
-                        env_vars["AWS_ACCESS_KEY_ID"]
-                        and env_vars["AWS_SECRET_ACCESS_KEY"]
-                    ):
-                        session = boto3.Session(
-                            aws_access_key_id=env_vars["AWS_ACCESS_KEY_ID"],
-                            aws_secret_access_key=env_vars["AWS_SECRET_ACCESS_KEY"],
-                        )
+                    access_key = get_config_value("AWS_ACCESS_KEY_ID")
+                    secret_key = get_config_value("AWS_SECRET_ACCESS_KEY")
 
-                        if validate_bedrock_access(session):
+                    if access_key and secret_key:
+                        client = _get_cached_runtime_client(
+                            access_key, secret_key, None, region
+                        )
+                        if client is not None:
                             logger.debug(
                                 "Successfully validated credentials from ~/.aki/.env"
                             )
-                            return session.client(
-                                "bedrock-runtime", region_name=region, config=config_obj
-                            )
+                            return client
                         logger.debug("Failed to validate credentials from ~/.aki/.env")
                 except Exception as e:
                     logger.warning(f"Error using credentials from ~/.aki/.env: {e}")
@@ -393,15 +482,13 @@ class BedrockProvider(LLMProvider):
             # 2. Try profile-based authentication
             logger.debug("Attempting to use aki profile authentication")
             try:
-                session = boto3.Session(profile_name="aki")
-                if validate_bedrock_access(session):
-                    logger.debug("Successfully validated aki profile credentials")
-                    return session.client(
-                        "bedrock-runtime", region_name=region, config=config_obj
-                    )
-                logger.debug("Failed to validate aki profile credentials")
+                client = _get_cached_runtime_client(
+                    None, None, "aki", region, validate=False
+                )
+                logger.debug("Using aki profile credentials")
+                return client
             except Exception as e:
-                logger.debug(f"Error using aki profile: {e}")
+                logger.debug("Error using aki profile: %s", e)
 
             # If we get here, neither method worked
             raise ValueError(
@@ -414,15 +501,42 @@ class BedrockProvider(LLMProvider):
             self._logger.error(f"Failed to create Bedrock client: {e}")
             raise
 
-    def _get_client(self) -> BaseClient:
+    def _get_client(self) -> "BaseClient":
         """Get or create a Bedrock client."""
-        if not self._client:
-            self._client = self._create_client()
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = self._create_client()
         return self._client
 
-    def _get_model_config(
-        self, model: str, tools: Optional[List] = None, **kwargs
-    ) -> Dict[str, Any]:
+    def invalidate_client(self, revalidate: bool = False) -> None:
+        """Discard the Bedrock client so the next model gets a fresh one.
+
+        Callers invoking Bedrock models should call this when a request fails
+        with an error matched by is_stale_connection_error, otherwise every
+        later request keeps reusing the dead connection pool. For errors
+        matched by is_auth_error, pass revalidate=True so the credentials are
+        checked again instead of trusting the recorded validation.
+
+        Args:
+            revalidate: Whether to also forget the session and its recorded
+                access check
+        """
+        client = self._client
+        self._client = None
+        if client is None:
+            return
+        with _client_cache_lock:
+            for key in [k for k, v in _runtime_client_cache.items() if v is client]:
+                del _runtime_client_cache[key]
+                if revalidate:
+                    access_key, secret_key, profile, _ = key
+                    _session_cache.pop((access_key, secret_key, profile), None)
+                    _forget_validation(
+                        _credential_fingerprint(access_key, secret_key, profile)
+                    )
+
+    def _get_model_config(self, model: str, **kwargs) -> Dict[str, Any]:
         """Get configuration for a specific model.
 
         This is a protected method that can be overridden by subclasses
@@ -430,7 +544,6 @@ class BedrockProvider(LLMProvider):
 
         Args:
             model: The model ID
-            tools: Optional list of tools for tool-calling models
             **kwargs: Additional model configuration parameters
 
         Returns:
@@ -440,38 +553,31 @@ class BedrockProvider(LLMProvider):
         enable_reasoning = kwargs.pop("enable_reasoning", False)
         budget_tokens = kwargs.pop("budget_tokens", 1024)
 
-        # Base model configuration
+        # Base model configuration, overridden by any remaining kwargs
         model_kwargs = {
             "model": model,
-            "max_tokens": kwargs.pop("max_tokens", 8192),
-            "temperature": kwargs.pop("temperature", 0.6),
+            "max_tokens": 8192,
+            "temperature": 0.6,
+            **kwargs,
         }
 
         # Add extended reasoning configuration if enabled for supported models
-        if (
-            enable_reasoning
-            and ModelCapability.EXTENDED_REASONING
-            in self._model_capabilities.get(model, set())
-        ):
+        if enable_reasoning and model in _REASONING_MODELS:
             self._logger.debug(
-                f"Enabling extended reasoning for {model} with budget {budget_tokens}"
+                "Enabling extended reasoning for %s with budget %s",
+                model,
+                budget_tokens,
             )
             # Claude 3.7 requires temperature=1.0 for extended reasoning
             model_kwargs["temperature"] = 1.0
             # Increase max_tokens to accommodate reasoning budget plus regular response
-            model_kwargs["max_tokens"] = budget_tokens + model_kwargs.get(
-                "max_tokens", 8192
-            )
+            model_kwargs["max_tokens"] += budget_tokens
             # Add reasoning configuration to model_kwargs
             model_kwargs["additional_model_request_fields"] = {
                 "thinking": {"type": "enabled", "budget_tokens": budget_tokens},
-                "anthropic_beta": ["token-efficient-tools-2025-02-19"],
+                "anthropic_beta": list(_REASONING_BETA_FEATURES),
             }
 
-        # Add any remaining kwargs
-        for key, value in kwargs.items():
-            model_kwargs[key] = value
-
         return model_kwargs
 
     def create_model(
@@ -495,20 +601,22 @@ class BedrockProvider(LLMProvider):
         max_cache_points = kwargs.pop("max_cache_points", 3)
 
         client = self._get_client()
-        model_kwargs = self._get_model_config(model, tools, **kwargs)
+        model_kwargs = self._get_model_config(model, **kwargs)
         model_kwargs["client"] = client
 
+        from langchain_aws import ChatBedrockConverse
+
+        from .bedrock_converse import CachingBedrockConverse
+
         try:
             # Check if caching is enabled and supported
-            use_caching = (
-                enable_prompt_cache
-                and ModelCapability.PROMPT_CACHING
-                in self._model_capabilities.get(model, set())
-            )
+            use_caching = enable_prompt_cache and model in _CACHING_MODELS
 
             if use_caching:
                 self._logger.debug(
-                    f"Creating model {model} with prompt caching enabled (max {max_cache_points} cache points)"
+                    "Creating model %s with prompt caching enabled (max %s cache points)",
+                    model,
+                    max_cache_points,
                 )
                 llm = CachingBedrockConverse(
                     name=name, max_cache_points=max_cache_points, **model_kwargs
@@ -517,12 +625,7 @@ class BedrockProvider(LLMProvider):
                 llm = ChatBedrockConverse(name=name, **model_kwargs)
 
             # Add tools if provided and supported
-            if (
-                tools
-                and len(tools) > 0
-                and ModelCapability.TOOL_CALLING
-                in self._model_capabilities.get(model, set())
-            ):
+            if tools and model in _TOOL_MODELS:
                 llm = llm.bind_tools(tools)
 
             return llm
@@ -544,36 +647,5 @@ class BedrockProvider(LLMProvider):
         return "bedrock"
 
     @property
-    def capabilities(self) -> Dict[str, Set[ModelCapability]]:
-        return {
-            "us.anthropic.claude-3-7-sonnet-20250219-v1:0": {
-                ModelCapability.TEXT_TO_TEXT,
-                ModelCapability.IMAGE_TO_TEXT,
-                ModelCapability.TOOL_CALLING,
-                ModelCapability.STRUCTURED_OUTPUT,
-                ModelCapability.EXTENDED_REASONING,
-                ModelCapability.PROMPT_CACHING,
-            },
-            "us.anthropic.claude-3-5-sonnet-20241022-v2:0": {
-                ModelCapability.TEXT_TO_TEXT,
-                ModelCapability.IMAGE_TO_TEXT,
-                ModelCapability.TOOL_CALLING,
-                ModelCapability.STRUCTURED_OUTPUT,
-            },
-            "us.anthropic.claude-3-5-haiku-20241022-v1:0": {
-                ModelCapability.TEXT_TO_TEXT,
-                ModelCapability.IMAGE_TO_TEXT,
-                ModelCapability.TOOL_CALLING,
-                ModelCapability.STRUCTURED_OUTPUT,
-                ModelCapability.PROMPT_CACHING,
-            },
-            "us.anthropic.claude-3-5-sonnet-20240620-v1:0": {
-                ModelCapability.TEXT_TO_TEXT,
-                ModelCapability.IMAGE_TO_TEXT,
-                ModelCapability.TOOL_CALLING,
-                ModelCapability.STRUCTURED_OUTPUT,
-            },
-            "stability.stable-image-ultra-v1:0": {ModelCapability.TEXT_TO_IMAGE},
-            "stability.stable-image-core-v1:0": {ModelCapability.TEXT_TO_IMAGE},
-            "us.deepseek.r1-v1:0": {ModelCapability.TEXT_TO_TEXT},
-        }
+    def capabilities(self) -> Dict[str, FrozenSet[ModelCapability]]:
+        return _CAPABILITIES
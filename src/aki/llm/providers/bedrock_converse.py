@@ -0,0 +1,237 @@
+"""Amazon Bedrock Converse chat model with prompt caching."""
+
+import logging
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from langchain_aws import ChatBedrockConverse
+from langchain_aws.chat_models.bedrock_converse import (
+    _messages_to_bedrock,
+    _snake_to_camel_keys,
+    _parse_response,
+    _parse_stream_event,
+)
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatResult, ChatGeneration, ChatGenerationChunk
+
+logger = logging.getLogger(__name__)
+
+# Invocation kwargs whose nested keys keep their snake case
+_CAMEL_EXCLUDED_KEYS = frozenset({"inputSchema", "properties", "thinking"})
+
+
+def _cache_point() -> Dict[str, Any]:
+    """Build the cache point block appended to system, message and tool lists.
+
+    A fresh block per append keeps requests from sharing mutable state.
+    """
+    return {"cachePoint": {"type": "default"}}
+
+
+def _inject_cache_points(
+    messages: List[Dict], system: List[Dict], max_cache_points: int = 3
+) -> tuple:
+    """Add cachePoint to system prompt and last 2 user messages for Bedrock.
+
+    Args:
+        messages: List of message dictionaries from Bedrock
+        system: Optional system message (string or dict)
+        max_cache_points: Maximum number of cache points to add (default: 3, ignored)
+
+    Returns:
+        Tuple of (modified messages list, modified system)
+    """
+    # 1. Always add a cache point to the system message if it exists.
+    # Build a new list so the caller's system blocks are never modified.
+    modified_system = system
+    if system:
+        last = system[-1]
+        if not (isinstance(last, dict) and "cachePoint" in last):
+            modified_system = [*system, _cache_point()]
+        logger.debug("Added cache point to system message")
+
+    # 2. Find the last 2 user messages (or all if less than 2) and mark
+    # them for cache points. Scan backwards so only the tail of a long
+    # history is visited.
+    last_user_indices = []
+    for i in range(len(messages) - 1, -1, -1):
+        if messages[i].get("role") == "user":
+            last_user_indices.append(i)
+            if len(last_user_indices) == 2:
+                break
+    if not last_user_indices:
+        return list(messages), modified_system
+
+    # 3. Copy the message list and replace only the selected messages,
+    # leaving every other message shared with the input
+    result = list(messages)
+    for idx in last_user_indices:
+        logger.debug("Marked user message at index %s for cache point", idx)
+        result[idx] = _add_cache_point(result[idx])
+
+    return result, modified_system
+
+
+def _add_cache_point(msg: Dict) -> Dict:
+    """Add a cache point to a single message.
+
+    The message is copied, so the input message and its content list are
+    never modified.
+    """
+    new_msg = dict(msg)
+
+    # Handle different content formats
+    content = new_msg.get("content")
+    if content is None:
+        content_list = []
+    elif isinstance(content, str):
+        # Convert string content to list with text item
+        content_list = [{"text": content}]
+    elif isinstance(content, list):
+        content_list = content
+    else:
+        # Convert other content to list
+        content_list = [content]
+
+    # Cache points are always appended, so only the last block can be one
+    last = content_list[-1] if content_list else None
+    if isinstance(last, dict) and "cachePoint" in last:
+        new_msg["content"] = content_list
+    else:
+        new_msg["content"] = [*content_list, _cache_point()]
+
+    # Print debug info
+    logger.debug(
+        "Added cache point to message with role: %s",
+        new_msg.get("role", "unknown"),
+    )
+
+    return new_msg
+
+
+class CachingBedrockConverse(ChatBedrockConverse):
+    """ChatBedrockConverse with prompt caching support."""
+
+    max_cache_points: int = 3  # Properly declare field for Pydantic model
+
+    def __init__(self, **kwargs):
+        """Initialize with caching configuration.
+
+        Args:
+            max_cache_points: Maximum number of cache points to add (default: 3)
+            All other kwargs are passed to the parent class
+        """
+        # Get max_cache_points to pass to parent class init
+        max_points = kwargs.pop("max_cache_points", 3)
+        super().__init__(**kwargs)
+        # Set the field after parent initialization
+        object.__setattr__(self, "max_cache_points", max_points)
+
+    def _converse_params(
+        self,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        """Override _converse_params to add cache points to tools configuration."""
+        # First get the parameters from the parent class
+        params = super()._converse_params(**kwargs)
+
+        # Add cache point to toolConfig if present
+        if "toolConfig" in params and params["toolConfig"] is not None:
+            tool_config = params["toolConfig"]
+            if "tools" in tool_config and tool_config["tools"] is not None:
+                tools_list = tool_config["tools"]
+                # Cache points are always appended, so only the last tool
+                # can be one
+                last = tools_list[-1] if tools_list else None
+                has_cache_point = isinstance(last, dict) and "cachePoint" in last
+                # Add cache point if needed, without touching the bound tools
+                if not has_cache_point:
+                    logger.debug("Adding cache point to tools configuration")
+                    params["toolConfig"] = {
+                        **tool_config,
+                        "tools": [*tools_list, _cache_point()],
+                    }
+
+        return params
+
+    def _prepare_request(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]],
+        kwargs: Dict[str, Any],
+    ) -> Tuple[List[Dict], List[Dict], Dict[str, Any]]:
+        """Build the Converse request shared by _generate and _stream.
+
+        Args:
+            messages: LangChain messages to send
+            stop: Optional stop sequences
+            kwargs: Extra invocation kwargs, in snake case
+
+        Returns:
+            Tuple of (bedrock messages, system, converse params)
+        """
+        # Get bedrock messages using the original function
+        bedrock_messages, system = _messages_to_bedrock(messages)
+
+        # Inject cache points to both regular messages and system
+        bedrock_messages, system = _inject_cache_points(
+            bedrock_messages, system=system, max_cache_points=self.max_cache_points
+        )
+
+        # Continue with regular process - similar to parent class
+        logger.debug("input message to bedrock: %s", bedrock_messages)
+        logger.debug("System message to bedrock: %s", system)
+        params = self._converse_params(
+            stop=stop,
+            **_snake_to_camel_keys(kwargs, excluded_keys=_CAMEL_EXCLUDED_KEYS),
+        )
+        logger.debug("Input params: %s", params)
+        return bedrock_messages, system, params
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager=None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        """Override _generate to add cache points to messages."""
+        bedrock_messages, system, params = self._prepare_request(messages, stop, kwargs)
+        logger.info(
+            "Using Bedrock Converse API to generate response with caching enabled"
+        )
+        response = self.client.converse(
+            messages=bedrock_messages, system=system, **params
+        )
+        logger.debug("Response from Bedrock: %s", response)
+        response_message = _parse_response(response)
+        response_message.response_metadata["model_name"] = self.model_id
+        return ChatResult(generations=[ChatGeneration(message=response_message)])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager=None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        """Override _stream to add cache points to messages."""
+        bedrock_messages, system, params = self._prepare_request(messages, stop, kwargs)
+        response = self.client.converse_stream(
+            messages=bedrock_messages, system=system, **params
+        )
+        added_model_name = False
+        for event in response["stream"]:
+            if message_chunk := _parse_stream_event(event):
+                if (
+                    hasattr(message_chunk, "usage_metadata")
+                    and message_chunk.usage_metadata
+                    and not added_model_name
+                ):
+                    message_chunk.response_metadata["model_name"] = self.model_id
+                    added_model_name = True
+                generation_chunk = ChatGenerationChunk(message=message_chunk)
+                if run_manager:
+                    run_manager.on_llm_new_token(
+                        generation_chunk.text, chunk=generation_chunk
+                    )
+                yield generation_chunk
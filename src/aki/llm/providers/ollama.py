@@ -1,5 +1,6 @@
-from typing import Optional, List, Dict, Set
+from typing import Optional, List, Dict, FrozenSet, Tuple
 import logging
+import time
 import requests
 from requests.exceptions import ConnectionError, RequestException
 import ollama
@@ -9,18 +10,54 @@ from langchain_ollama.chat_models import ChatOllama
 from ..capabilities import ModelCapability
 from .base import LLMProvider
 
+# Capabilities of each supported model
+_CAPABILITIES: Dict[str, FrozenSet[ModelCapability]] = {
+    "deepseek-r1:70b": frozenset(
+        {
+            ModelCapability.TEXT_TO_TEXT,
+            ModelCapability.STRUCTURED_OUTPUT,
+        }
+    ),
+    "MFDoom/deepseek-r1-tool-calling:70b": frozenset(
+        {
+            ModelCapability.TEXT_TO_TEXT,
+            ModelCapability.TOOL_CALLING,
+            ModelCapability.STRUCTURED_OUTPUT,
+        }
+    ),
+}
+_TOOL_MODELS = frozenset(
+    m for m, caps in _CAPABILITIES.items() if ModelCapability.TOOL_CALLING in caps
+)
+# Seconds an availability probe or model list is reused before asking again
+_PROBE_TTL = 5.0
+
 
 class OllamaProvider(LLMProvider):
     OLLAMA_API = "http://localhost:11434"
 
+    def __init__(self):
+        # Pooled connection reused by availability probes
+        self._session = requests.Session()
+        # (expiry, result) of the last availability probe and model listing
+        self._available_cache: Optional[Tuple[float, bool]] = None
+        self._models_cache: Optional[Tuple[float, List[str]]] = None
+
     def is_available(self) -> bool:
         """Check if Ollama service is available"""
+        now = time.monotonic()
+        cached = self._available_cache
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
         try:
-            requests.get(f"{self.OLLAMA_API}/api/version", timeout=1)
-            return True
+            self._session.get(f"{self.OLLAMA_API}/api/version", timeout=1)
+            available = True
         except (ConnectionError, RequestException):
             logging.debug("Ollama service is not available")
-            return False
+            available = False
+        self._available_cache = (now + _PROBE_TTL, available)
+        return available
 
     def create_model(
         self, name: str, model: str, tools: Optional[List] = None, **kwargs
@@ -35,42 +72,37 @@ class OllamaProvider(LLMProvider):
             temperature=0.2,
         )
 
-        if (
-            tools
-            and len(tools) > 0
-            and ModelCapability.TOOL_CALLING in self.capabilities.get(model, set())
-        ):
+        # Availability was checked above, so skip the capabilities property
+        # and its second request to the service
+        if tools and model in _TOOL_MODELS:
             llm = llm.bind_tools(tools)
         return llm
 
     def list_models(self) -> List[str]:
+        now = time.monotonic()
+        cached = self._models_cache
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
         if not self.is_available():
             logging.debug("Ollama service is not available, returning empty model list")
             return []
 
         try:
-            return [m.model for m in ollama.list().models]
+            models = [m.model for m in ollama.list().models]
         except Exception as e:
             logging.warning(f"Failed to list Ollama models: {e}")
             return []
+        self._models_cache = (now + _PROBE_TTL, models)
+        return models
 
     @property
     def name(self) -> str:
         return "ollama"
 
     @property
-    def capabilities(self) -> Dict[str, Set[ModelCapability]]:
+    def capabilities(self) -> Dict[str, FrozenSet[ModelCapability]]:
         if not self.is_available():
             return {}
 
-        return {
-            "deepseek-r1:70b": {
-                ModelCapability.TEXT_TO_TEXT,
-                ModelCapability.STRUCTURED_OUTPUT,
-            },
-            "MFDoom/deepseek-r1-tool-calling:70b": {
-                ModelCapability.TEXT_TO_TEXT,
-                ModelCapability.TOOL_CALLING,
-                ModelCapability.STRUCTURED_OUTPUT,
-            },
-        }
+        return _CAPABILITIES
@@ -1,4 +1,6 @@
-from typing import List, Any
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
+import hashlib
 import json
 
 import tiktoken
@@ -10,10 +12,113 @@ from langchain_core.messages import (
     SystemMessage,
 )
 
+from aki.config.constants import DEFAULT_TOKENIZER_MODEL
+
+_encoding: Optional[tiktoken.Encoding] = None
+
+# Role of each supported message class, in the order subclasses are matched
+_BASE_ROLES = (
+    (HumanMessage, "user"),
+    (AIMessage, "assistant"),
+    (ToolMessage, "tool"),
+    (SystemMessage, "system"),
+)
+# Role per exact message class; subclasses (e.g. chunks) are added on first use
+_message_roles: Dict[type, str] = dict(_BASE_ROLES)
+
+# Upper bound for the role tokens of any message ("assistant" is the longest)
+_MAX_ROLE_TOKENS = 4 * len("assistant")
+
+# Token counts of longer texts keyed by a digest of their content. History
+# is re-counted on every turn (and several times per trim), but rarely changes.
+_count_cache: Dict[bytes, int] = {}
+_COUNT_CACHE_MAXSIZE = 4096
+# Shorter texts are cheaper to encode than to hash and look up
+_MIN_CACHED_LENGTH = 256
+# Uncached long texts needed before they are encoded on tiktoken's thread
+# pool; below this, spinning up the pool costs more than it saves
+_MIN_BATCH_SIZE = 8
+
+
+def get_encoding() -> tiktoken.Encoding:
+    """Get the shared tokenizer, loading it on first use."""
+    global _encoding
+    if _encoding is None:
+        _encoding = tiktoken.get_encoding(DEFAULT_TOKENIZER_MODEL)
+    return _encoding
+
+
+def _cache_key(text: str) -> bytes:
+    return hashlib.blake2b(
+        text.encode("utf-8", "surrogatepass"), digest_size=16
+    ).digest()
+
+
+def _remember_count(key: bytes, count: int) -> None:
+    if len(_count_cache) >= _COUNT_CACHE_MAXSIZE:
+        _count_cache.clear()
+    _count_cache[key] = count
+
 
 def str_token_counter(text: str) -> int:
-    enc = tiktoken.get_encoding("o200k_base")
-    return len(enc.encode(text))
+    if len(text) < _MIN_CACHED_LENGTH:
+        return len(get_encoding().encode(text))
+
+    key = _cache_key(text)
+    count = _count_cache.get(key)
+    if count is None:
+        count = len(get_encoding().encode(text))
+        _remember_count(key, count)
+    return count
+
+
+@lru_cache(maxsize=None)
+def _role_token_count(role: str) -> int:
+    """Token count of a message role, which is one of a handful of strings."""
+    return len(get_encoding().encode(role))
+
+
+def _message_role(msg_type: type) -> str:
+    """Resolve the role of a message class that isn't in _message_roles yet.
+
+    Raises:
+        ValueError: If the class isn't one of the supported message types
+    """
+    for base, role in _BASE_ROLES:
+        if issubclass(msg_type, base):
+            _message_roles[msg_type] = role
+            return role
+    raise ValueError(f"Unsupported messages type {msg_type}")
+
+
+def _sum_token_counts(texts: List[str]) -> int:
+    """Total the token counts of texts, encoding many uncached ones at once.
+
+    tiktoken releases the GIL while encoding, so a cold history with many
+    long messages is counted in parallel by encode_batch.
+    """
+    encoding = get_encoding()
+    total = 0
+    misses: List[Tuple[bytes, str]] = []
+    for text in texts:
+        if len(text) < _MIN_CACHED_LENGTH:
+            total += len(encoding.encode(text))
+            continue
+        key = _cache_key(text)
+        count = _count_cache.get(key)
+        if count is None:
+            misses.append((key, text))
+        else:
+            total += count
+
+    if len(misses) < _MIN_BATCH_SIZE:
+        counts = [len(encoding.encode(text)) for _, text in misses]
+    else:
+        tokens = encoding.encode_batch([text for _, text in misses])
+        counts = [len(t) for t in tokens]
+    for (key, _), count in zip(misses, counts):
+        _remember_count(key, count)
+    return total + sum(counts)
 
 
 def tiktoken_counter(messages: List[BaseMessage]) -> int:
@@ -24,32 +129,41 @@ def tiktoken_counter(messages: List[BaseMessage]) -> int:
     num_tokens = 3  # every reply is primed with <|start|>assistant<|message|>
     tokens_per_message = 3
     tokens_per_name = 1
+    # Collect content and names first so uncached ones can be encoded in one
+    # batch
+    texts = []
     for msg in messages:
-        if isinstance(msg, HumanMessage):
-            role = "user"
-        elif isinstance(msg, AIMessage):
-            role = "assistant"
-        elif isinstance(msg, ToolMessage):
-            role = "tool"
-        elif isinstance(msg, SystemMessage):
-            role = "system"
-        else:
-            raise ValueError(f"Unsupported messages type {msg.__class__}")
-        num_tokens += (
-            tokens_per_message
-            + str_token_counter(role)
-            + str_token_counter(format_content(msg.content))
-        )
+        role = _message_roles.get(type(msg)) or _message_role(type(msg))
+        num_tokens += tokens_per_message + _role_token_count(role)
+        texts.append(format_content(msg.content))
         if msg.name:
-            num_tokens += tokens_per_name + str_token_counter(msg.name)
-    return num_tokens
+            num_tokens += tokens_per_name
+            texts.append(msg.name)
+    return num_tokens + _sum_token_counts(texts)
 
 
 def format_content(content: Any) -> str:
     """Convert content to string if it's not already a string."""
-    if isinstance(content, str):
+    # Exact type check first: message content is almost always a plain str
+    if type(content) is str:
         return content
     elif isinstance(content, (dict, list)):
         return json.dumps(content)
+    elif isinstance(content, str):
+        return content
     else:
         return str(content)
+
+
+def max_token_estimate(messages: List[BaseMessage]) -> int:
+    """Cheap upper bound for tiktoken_counter that doesn't encode anything.
+
+    Every BPE token covers at least one byte and UTF-8 needs at most four
+    bytes per character, so a text never has more tokens than 4x its length.
+    """
+    num_tokens = 3
+    for msg in messages:
+        num_tokens += 3 + _MAX_ROLE_TOKENS + 4 * len(format_content(msg.content))
+        if msg.name:
+            num_tokens += 1 + 4 * len(msg.name)
+    return num_tokens
@@ -1,6 +1,8 @@
+import inspect
 import json
 import logging
 from dataclasses import asdict
+from functools import lru_cache
 from typing import Any
 
 from langchain_core.messages import (
@@ -19,6 +21,12 @@ from aki.chat.base.environment_details import EnvironmentDetails
 from aki.persistence.models import State
 
 
+@lru_cache(maxsize=None)
+def _init_params(cls: type) -> frozenset[str]:
+    """Get the parameter names accepted by a class's __init__."""
+    return frozenset(inspect.signature(cls.__init__).parameters)
+
+
 class StateDAL:
     MESSAGE_TYPE_MAPPING = {
         "human": HumanMessage,
@@ -55,13 +63,17 @@ class StateDAL:
         serialized_state = {}
 
         for key, value in state.items():
-            if isinstance(value, EnvironmentDetails):
-                env_dict = asdict(value)  # Convert EnvironmentDetails to a dictionary
-                serialized_state[key] = env_dict
-            elif key == "messages":
+            # Check the key first: a string compare is cheaper than isinstance
+            # and messages is the one key present in every state
+            if key == "messages":
                 serialized_state[key] = [
-                    msg.model_dump() for msg in value if msg is not None
+                    msg.model_dump(mode="json") for msg in value if msg is not None
                 ]
+            elif type(value) is str:
+                serialized_state[key] = value
+            elif isinstance(value, EnvironmentDetails):
+                env_dict = asdict(value)  # Convert EnvironmentDetails to a dictionary
+                serialized_state[key] = env_dict
             else:
                 serialized_state[key] = value
 
@@ -102,12 +114,10 @@ class StateDAL:
             return data
 
         # Filter out attributes that don't exist in the current class
-        import inspect
-
-        valid_params = inspect.signature(cls.__init__).parameters.keys()
+        valid_params = _init_params(cls)
 
         # Identify fields that need to be filtered out
-        invalid_fields = set(data.keys()) - set(valid_params)
+        invalid_fields = data.keys() - valid_params
         if invalid_fields:
             logging.debug(
                 f"Filtering out non-existent fields from {cls.__name__}: {invalid_fields}"
@@ -119,7 +129,5 @@ class StateDAL:
 
     def _deserialize_messages(self, messages: list) -> list[BaseMessage]:
         """Convert stored messages back into appropriate Message objects."""
-        return [
-            self.MESSAGE_TYPE_MAPPING.get(msg.get("type"), BaseMessage)(**msg)
-            for msg in messages
-        ]
+        class_for_type = self.MESSAGE_TYPE_MAPPING.get
+        return [class_for_type(msg.get("type"), BaseMessage)(**msg) for msg in messages]
@@ -2,15 +2,24 @@ import asyncio
 import logging
 from abc import ABC, abstractmethod
 from contextlib import asynccontextmanager
+from functools import lru_cache
 from pathlib import Path
 from typing import AsyncContextManager, Optional
 
-import sqlparse
 from chainlit.data.chainlit_data_layer import ChainlitDataLayer
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
+# Use orjson to decode JSON columns when it's installed; state payloads with
+# long message histories are the bulk of what gets read
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # Create a logger specific to the database manager
 logger = logging.getLogger("aki.persistence.database_manager")
 
@@ -32,9 +41,19 @@ class DatabaseManager(ABC):
         pass
 
     @staticmethod
-    def _split_sql_statements(sql_content: str) -> list[str]:
-        """Split SQL script into executable statements."""
-        return [stmt.strip() for stmt in sqlparse.split(sql_content) if stmt.strip()]
+    @lru_cache(maxsize=4)
+    def _split_sql_statements(sql_content: str) -> tuple[str, ...]:
+        """Split SQL script into executable statements.
+
+        The schema scripts are static, so each is only parsed once per process.
+        sqlparse is imported here because it is slow to import and only needed
+        when a schema is initialized.
+        """
+        import sqlparse
+
+        return tuple(
+            stmt.strip() for stmt in sqlparse.split(sql_content) if stmt.strip()
+        )
 
     async def _initialize_schema(self) -> None:
         """Initialize the database schema using SQL statements."""
@@ -42,8 +61,8 @@ class DatabaseManager(ABC):
         schema_path = Path(__file__).parent / self._get_sql_schema_filename()
 
         try:
-            with open(schema_path, "r") as file:
-                sql_content = file.read()
+            # Read in a worker thread so the event loop isn't blocked
+            sql_content = await asyncio.to_thread(schema_path.read_text)
         except Exception as e:
             logger.error(f"Error reading schema file: {e}")
             return
@@ -76,10 +95,12 @@ class DatabaseManager(ABC):
     def _get_engine(self):
         """Lazily initialize and return engine and session maker."""
         if self._engine is None:
+            json_kwargs = {"json_deserializer": orjson.loads} if HAS_ORJSON else {}
             self._engine = create_async_engine(
                 self._async_database_url,
                 pool_recycle=1800,  # Recycle connections after 30 minutes
                 pool_pre_ping=True,  # Verify connections before use
+                **json_kwargs,
             )
             self._async_session_local = sessionmaker(
                 bind=self._engine, class_=AsyncSession, expire_on_commit=False
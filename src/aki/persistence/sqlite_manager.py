@@ -8,10 +8,31 @@ from pathlib import Path
 
 from chainlit.data import BaseDataLayer
 from chainlit.data.storage_clients.base import BaseStorageClient
+from sqlalchemy import event
 
 from aki.persistence.chainlit_sqlite_adapter import ChainlitSQLiteAdapter
 from aki.persistence.database_manager import DatabaseManager
 
+# Applied to every new connection. WAL lets readers run alongside the writer
+# and, with synchronous=NORMAL, only syncs on checkpoints instead of on every
+# commit, which is what state upserts pay for most.
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",  # 256 MiB
+    "PRAGMA cache_size=-65536",  # 64 MiB
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
 
 class SQLiteManager(DatabaseManager):
     """
@@ -33,6 +54,14 @@ class SQLiteManager(DatabaseManager):
         self._async_database_url = f"sqlite+aiosqlite:///{self.db_path}"
         os.environ["AKI_SQLITE_URL"] = self._async_database_url
 
+    def _get_engine(self):
+        """Create the engine on first use with the SQLite pragmas applied."""
+        created = self._engine is None
+        engine, async_session_local = super()._get_engine()
+        if created:
+            event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+        return engine, async_session_local
+
     @property
     def db_type(self) -> str:
         """Return the database type identifier."""
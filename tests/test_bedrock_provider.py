@@ -1,15 +1,31 @@
 """Tests for the Bedrock provider."""
 
+import json
 import pytest
+import subprocess
+import sys
 from unittest.mock import patch, MagicMock
 
-
 from aki.llm.capabilities import ModelCapability
+from aki.llm.providers import bedrock, bedrock_converse
 from aki.llm.providers.bedrock import (
     BedrockProvider,
+    is_stale_connection_error,
     validate_bedrock_access,
     create_session_from_env,
 )
+from aki.llm.providers.bedrock_converse import CachingBedrockConverse
+
+
+@pytest.fixture(autouse=True)
+def clear_shared_clients(tmp_path, monkeypatch):
+    """Keep cached configuration, sessions and clients from leaking between tests."""
+    monkeypatch.setattr(
+        bedrock, "_validation_marker_path", lambda: tmp_path / ".bedrock_validated"
+    )
+    bedrock._reset_caches()
+    yield
+    bedrock._reset_caches()
 
 
 class TestBedrockHelperFunctions:
@@ -23,7 +39,7 @@ class TestBedrockHelperFunctions:
         mock_get_config.return_value = "us-west-2"
         mock_client = MagicMock()
         mock_client.list_foundation_models.return_value = {
-            "modelSummaries": ["model1", "model2"]
+            "modelSummaries": [{"modelId": "model1"}]
         }
         mock_session_instance = MagicMock()
         mock_session_instance.client.return_value = mock_client
@@ -34,7 +50,9 @@ class TestBedrockHelperFunctions:
 
         # Check the result
         assert result is True
-        mock_client.list_foundation_models.assert_called_once()
+        mock_client.list_foundation_models.assert_called_once_with(
+            byProvider="anthropic"
+        )
 
     @patch("boto3.Session")
     @patch("aki.config.environment.get_config_value")
@@ -54,6 +72,19 @@ class TestBedrockHelperFunctions:
         # Check the result
         assert result is False
 
+    def test_validate_bedrock_access_denied(self):
+        """Test that an authorization error fails validation."""
+        from botocore.exceptions import ClientError
+
+        mock_client = MagicMock()
+        mock_client.list_foundation_models.side_effect = ClientError(
+            {"Error": {"Code": "AccessDeniedException"}}, "ListFoundationModels"
+        )
+        mock_session_instance = MagicMock()
+        mock_session_instance.client.return_value = mock_client
+
+        assert validate_bedrock_access(mock_session_instance) is False
+
     def test_create_session_from_env_success(self):
         """Test creating session with valid credentials."""
         # Set up the env vars
@@ -83,6 +114,27 @@ class TestBedrockHelperFunctions:
                 aws_access_key_id="test_key", aws_secret_access_key="test_secret"
             )
 
+    def test_create_session_from_env_shared_with_provider(self):
+        """Test that a provider reuses the session validated from env vars."""
+        env_vars = {
+            "AWS_ACCESS_KEY_ID": "test_key",
+            "AWS_SECRET_ACCESS_KEY": "test_secret",
+        }
+        with (
+            patch("boto3.Session") as mock_session,
+            patch(
+                "aki.llm.providers.bedrock.validate_bedrock_access", return_value=True
+            ) as mock_validate,
+        ):
+            session, _ = create_session_from_env(env_vars)
+            client = bedrock._get_cached_runtime_client(
+                "test_key", "test_secret", None, "us-west-2"
+            )
+
+        assert client is session.client.return_value
+        mock_session.assert_called_once()
+        mock_validate.assert_called_once()
+
     def test_create_session_from_env_missing_keys(self):
         """Test creating session with missing credentials."""
         # Set up env vars with missing key
@@ -122,6 +174,121 @@ class TestBedrockHelperFunctions:
             assert message == "Failed to validate Bedrock access"
 
 
+class TestCachePointInjection:
+    """Tests for cache point injection."""
+
+    CACHE_POINT = {"cachePoint": {"type": "default"}}
+
+    def test_last_two_user_messages_marked(self):
+        messages = [
+            {"role": "user", "content": [{"text": "first"}]},
+            {"role": "assistant", "content": [{"text": "reply"}]},
+            {"role": "user", "content": [{"text": "second"}]},
+            {"role": "assistant", "content": [{"text": "reply"}]},
+            {"role": "user", "content": [{"text": "third"}]},
+        ]
+        result, _ = bedrock_converse._inject_cache_points(messages, [])
+
+        assert [self.CACHE_POINT in msg["content"] for msg in result] == [
+            False,
+            False,
+            True,
+            False,
+            True,
+        ]
+        # Unselected messages are shared, selected ones are copies
+        assert result[0] is messages[0]
+        assert result[4] is not messages[4]
+        assert messages[4]["content"] == [{"text": "third"}]
+
+    def test_system_cache_point_added_once(self):
+        system = [{"text": "You are helpful."}]
+        _, first = bedrock_converse._inject_cache_points([], system)
+        _, second = bedrock_converse._inject_cache_points([], first)
+
+        assert first == [{"text": "You are helpful."}, self.CACHE_POINT]
+        assert second == first
+        assert system == [{"text": "You are helpful."}]
+
+    def test_no_user_messages(self):
+        messages = [{"role": "assistant", "content": [{"text": "reply"}]}]
+        result, _ = bedrock_converse._inject_cache_points(messages, [])
+
+        assert result == messages
+        assert result is not messages
+
+    def test_cache_point_not_duplicated(self):
+        msg = {"role": "user", "content": [{"text": "hi"}, self.CACHE_POINT]}
+        assert bedrock_converse._add_cache_point(msg)["content"] == msg["content"]
+
+    def test_string_content_converted(self):
+        msg = {"role": "user", "content": "hi"}
+        assert bedrock_converse._add_cache_point(msg)["content"] == [
+            {"text": "hi"},
+            self.CACHE_POINT,
+        ]
+
+
+class TestCachingBedrockConverse:
+    """Tests for the prompt caching chat model."""
+
+    def test_tools_cache_point_added(self):
+        tools = [{"toolSpec": {"name": "calculator"}}]
+        parent_params = {"toolConfig": {"tools": tools}, "inferenceConfig": {}}
+        llm = CachingBedrockConverse.model_construct(max_cache_points=3)
+
+        with patch(
+            "langchain_aws.ChatBedrockConverse._converse_params",
+            return_value=parent_params,
+        ):
+            params = llm._converse_params(stop=["\n"])
+
+        assert params["toolConfig"]["tools"][-1] == {"cachePoint": {"type": "default"}}
+        # The bound tools themselves are left untouched
+        assert tools == [{"toolSpec": {"name": "calculator"}}]
+
+    def test_tools_cache_point_not_duplicated(self):
+        tools = [
+            {"toolSpec": {"name": "calculator"}},
+            {"cachePoint": {"type": "default"}},
+        ]
+        parent_params = {"toolConfig": {"tools": tools}}
+        llm = CachingBedrockConverse.model_construct(max_cache_points=3)
+
+        with patch(
+            "langchain_aws.ChatBedrockConverse._converse_params",
+            return_value=parent_params,
+        ):
+            params = llm._converse_params()
+
+        assert params["toolConfig"]["tools"] == tools
+
+
+class TestStaleConnectionError:
+    """Tests for is_stale_connection_error."""
+
+    def test_connection_errors(self):
+        from botocore.exceptions import ConnectionClosedError, EndpointConnectionError
+        from urllib3.exceptions import ProtocolError
+
+        assert is_stale_connection_error(
+            ConnectionClosedError(endpoint_url="https://example.com")
+        )
+        assert is_stale_connection_error(
+            EndpointConnectionError(endpoint_url="https://example.com")
+        )
+        assert is_stale_connection_error(ProtocolError("Connection aborted."))
+
+    def test_other_errors(self):
+        assert not is_stale_connection_error(ValueError("bad request"))
+
+        try:
+            assert False
+        except AssertionError as e:
+            # Raised from this module, not the HTTP stack
+            assert not is_stale_connection_error(e)
+
+
 class TestBedrockProvider:
     """Tests for the BedrockProvider class."""
 
@@ -220,7 +387,8 @@ class TestBedrockProvider:
         # Check the result
         assert result == mock_client
         mock_session.assert_called_with(profile_name="aki")
-        mock_validate.assert_called_with(mock_session_instance)
+        # The profile is the last option, so access isn't checked up front
+        mock_validate.assert_not_called()
 
     @patch("aki.config.environment.get_config_value")
     @patch("aki.config.paths.get_env_file")
@@ -241,9 +409,9 @@ class TestBedrockProvider:
         mock_env_path = MagicMock()
         mock_get_env_file.return_value = mock_env_path
         mock_exists.return_value = False  # No .env file
-        mock_session_instance = MagicMock()
-        mock_session.return_value = mock_session_instance
-        mock_validate.return_value = False  # Validation fails
+        mock_session.side_effect = Exception(
+            "The config profile (aki) could not be found"
+        )
 
         # Create provider
         provider = BedrockProvider()
@@ -267,6 +435,175 @@ class TestBedrockProvider:
             assert client1 == client2 == mock_client
             mock_create.assert_called_once()
 
+    @patch("pathlib.Path.exists", return_value=False)
+    @patch("boto3.Session")
+    @patch("aki.llm.providers.bedrock.validate_bedrock_access", return_value=True)
+    def test_client_shared_across_providers(
+        self, mock_validate, mock_session, mock_exists
+    ):
+        """Test that providers reuse a validated session and client."""
+        first = BedrockProvider()._create_client()
+        second = BedrockProvider()._create_client()
+
+        assert first is second
+        mock_session.assert_called_once_with(profile_name="aki")
+
+    @patch.dict(
+        "os.environ",
+        {"AWS_ACCESS_KEY_ID": "test_key", "AWS_SECRET_ACCESS_KEY": "test_secret"},
+    )
+    @patch("pathlib.Path.exists", return_value=True)
+    @patch("boto3.Session")
+    @patch("aki.llm.providers.bedrock.validate_bedrock_access", return_value=False)
+    def test_failed_validation_not_cached(
+        self, mock_validate, mock_session, mock_exists
+    ):
+        """Test that invalid .env credentials fall back and are checked again."""
+        for _ in range(2):
+            BedrockProvider()._create_client()
+
+        assert mock_validate.call_count == 2
+        mock_session.assert_called_with(profile_name="aki")
+
+    def test_model_config_defaults_and_overrides(self):
+        """Test that _get_model_config merges kwargs over the defaults."""
+        provider = BedrockProvider()
+        config = provider._get_model_config("some-model", temperature=0.2, top_p=0.9)
+
+        assert config == {
+            "model": "some-model",
+            "max_tokens": 8192,
+            "temperature": 0.2,
+            "top_p": 0.9,
+        }
+
+    def test_model_config_extended_reasoning(self):
+        """Test the reasoning settings for a model that supports them."""
+        provider = BedrockProvider()
+        model = "us.anthropic.claude-3-7-sonnet-20250219-v1:0"
+        config = provider._get_model_config(
+            model, enable_reasoning=True, budget_tokens=2048, max_tokens=4096
+        )
+
+        assert config["temperature"] == 1.0
+        assert config["max_tokens"] == 2048 + 4096
+        assert config["additional_model_request_fields"]["thinking"] == {
+            "type": "enabled",
+            "budget_tokens": 2048,
+        }
+        assert "enable_reasoning" not in config
+        assert "budget_tokens" not in config
+
+        # Each config gets its own beta feature list
+        other = provider._get_model_config(model, enable_reasoning=True)
+        betas = config["additional_model_request_fields"]["anthropic_beta"]
+        assert betas == ["token-efficient-tools-2025-02-19"]
+        assert betas is not other["additional_model_request_fields"]["anthropic_beta"]
+
+    def test_invalidate_client(self):
+        """Test that invalidating drops the provider's and the shared client."""
+        client = MagicMock()
+        bedrock._runtime_client_cache[("key", "secret", None, "us-west-2")] = client
+        provider = BedrockProvider()
+        provider._client = client
+
+        provider.invalidate_client()
+
+        assert provider._client is None
+        assert not bedrock._runtime_client_cache
+
+    @patch("aki.llm.providers.bedrock.validate_bedrock_access", return_value=True)
+    def test_invalidate_client_after_auth_error_revalidates(self, mock_validate):
+        """Test that revalidating forgets the session and the recorded check."""
+        with patch("boto3.Session"):
+            client = bedrock._get_cached_runtime_client(
+                "key", "secret", None, "us-west-2"
+            )
+        provider = BedrockProvider()
+        provider._client = client
+
+        provider.invalidate_client(revalidate=True)
+
+        assert not bedrock._session_cache
+        assert not bedrock._recently_validated(
+            bedrock._credential_fingerprint("key", "secret", None)
+        )
+
+    def test_validation_marker_holds_no_secret(self):
+        """Test that the recorded check doesn't include the secret key."""
+        fingerprint = bedrock._credential_fingerprint("key", "secret", None)
+        bedrock._record_validation(fingerprint)
+        assert "secret" not in bedrock._validation_marker_path().read_text()
+        assert bedrock._recently_validated(fingerprint)
+
+    def test_changed_secret_not_trusted(self):
+        """Test that a check recorded for one secret doesn't cover another."""
+        bedrock._record_validation(bedrock._credential_fingerprint("key", "old", None))
+        assert not bedrock._recently_validated(
+            bedrock._credential_fingerprint("key", "new", None)
+        )
+
+    def test_expired_checks_pruned(self):
+        """Test that recording a check drops expired entries."""
+        path = bedrock._validation_marker_path()
+        path.write_text(
+            json.dumps({"key:old": {"region": "us-west-2", "timestamp": 0}})
+        )
+        bedrock._record_validation("profile:dev")
+        assert list(json.loads(path.read_text())) == ["profile:dev"]
+
+    def test_is_auth_error(self):
+        """Test that only rejected-credential errors count as auth errors."""
+        from botocore.exceptions import ClientError
+
+        denied = ClientError(
+            {"Error": {"Code": "ExpiredTokenException"}}, "ConverseStream"
+        )
+        throttled = ClientError(
+            {"Error": {"Code": "ThrottlingException"}}, "ConverseStream"
+        )
+        assert bedrock.is_auth_error(denied)
+        assert not bedrock.is_auth_error(throttled)
+        assert not bedrock.is_auth_error(ValueError())
+
+    def test_get_client_creates_once_across_threads(self):
+        """Test that concurrent _get_client calls share one client."""
+        from concurrent.futures import ThreadPoolExecutor
+        import time
+
+        def create_client():
+            time.sleep(0.05)
+            return MagicMock()
+
+        provider = BedrockProvider()
+        with patch.object(
+            provider, "_create_client", side_effect=create_client
+        ) as mock_create:
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                clients = list(pool.map(lambda _: provider._get_client(), range(4)))
+
+        assert all(client is clients[0] for client in clients)
+        mock_create.assert_called_once()
+
+    @patch.dict(
+        "os.environ",
+        {"AWS_ACCESS_KEY_ID": "test_key", "AWS_SECRET_ACCESS_KEY": "test_secret"},
+    )
+    @patch("pathlib.Path.exists", return_value=True)
+    @patch("boto3.Session")
+    @patch("aki.llm.providers.bedrock.validate_bedrock_access", return_value=True)
+    def test_validation_remembered_across_processes(
+        self, mock_validate, mock_session, mock_exists
+    ):
+        """Test that a recorded successful check skips the next one."""
+        BedrockProvider()._create_client()
+        # Simulate a new process: in-memory caches are gone, the marker stays
+        bedrock._session_cache.clear()
+        bedrock._runtime_client_cache.clear()
+        BedrockProvider()._create_client()
+
+        mock_validate.assert_called_once()
+
     def test_initialize_model_capabilities(self):
         """Test model capabilities dictionary."""
         provider = BedrockProvider()
@@ -289,3 +626,16 @@ class TestBedrockProvider:
         assert stable_image in capabilities
         assert ModelCapability.TEXT_TO_IMAGE in capabilities[stable_image]
         assert ModelCapability.EXTENDED_REASONING in capabilities[claude_37]
+
+    def test_sdks_not_imported_until_used(self):
+        """Test that creating the provider doesn't load boto3 or langchain_aws."""
+        code = (
+            "import sys\n"
+            "from aki.llm.providers.bedrock import BedrockProvider\n"
+            "BedrockProvider()\n"
+            "print('boto3' in sys.modules, 'langchain_aws' in sys.modules)\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert result.stdout.split() == ["False", "False"]
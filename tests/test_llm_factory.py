@@ -0,0 +1,261 @@
+"""Tests for the LLM factory."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from aki.llm.capabilities import ModelCapability
+from aki.llm.factory import LLMFactory, _extract_cache_params
+from aki.llm.reasoning import ReasoningConfig
+from aki.llm.providers.base import LLMProvider
+
+
+class FakeProvider(LLMProvider):
+    """Minimal provider returning mock models."""
+
+    def __init__(self, provider_name="fake", models=None):
+        self._name = provider_name
+        self._capabilities = models or {
+            "chat-model": {ModelCapability.TEXT_TO_TEXT, ModelCapability.TOOL_CALLING},
+            "text-model": {ModelCapability.TEXT_TO_TEXT},
+        }
+        self.created = []
+        self.capability_lookups = 0
+
+    def create_model(self, name, model, tools=None, **kwargs):
+        instance = MagicMock(name=f"{self._name}:{model}")
+        self.created.append((name, model, tools, kwargs))
+        return instance
+
+    def list_models(self):
+        return list(self._capabilities)
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def capabilities(self):
+        self.capability_lookups += 1
+        return self._capabilities
+
+
+@pytest.fixture
+def provider():
+    return FakeProvider()
+
+
+@pytest.fixture
+def factory(provider):
+    factory = LLMFactory()
+    factory.register_provider("fake", provider)
+    return factory
+
+
+class TestParseModelId:
+    """Tests for model id parsing."""
+
+    def test_known_provider(self, factory, provider):
+        provider_name, model_name, capabilities, parsed_provider = (
+            factory._parse_model_id("(fake)chat-model")
+        )
+        assert provider_name == "fake"
+        assert model_name == "chat-model"
+        assert ModelCapability.TOOL_CALLING in capabilities
+        assert parsed_provider is provider
+
+    def test_prefix_only_stripped_once(self, factory):
+        _, model_name, _, _ = factory._parse_model_id("(fake)wrapper-(fake)model")
+        assert model_name == "wrapper-(fake)model"
+
+    def test_results_cached_until_cleared(self, factory, provider):
+        first = factory._parse_model_id("(fake)chat-model")
+        provider._capabilities = {}
+        assert factory._parse_model_id("(fake)chat-model") is first
+
+        factory.clear_cache()
+        assert not factory.get_model_capabilities("(fake)chat-model")
+
+    def test_capabilities_reuse_parse_from_create_model(self, factory, provider):
+        factory.create_model("test", "(fake)chat-model")
+        lookups = provider.capability_lookups
+
+        capabilities = factory.get_model_capabilities("(fake)chat-model")
+        assert ModelCapability.TOOL_CALLING in capabilities
+        assert provider.capability_lookups == lookups
+
+    def test_unknown_provider(self, factory):
+        provider_name, model_name, capabilities, provider = factory._parse_model_id(
+            "(other)chat-model"
+        )
+        assert provider_name is None
+        assert model_name == "(other)chat-model"
+        assert not capabilities
+        assert provider is None
+
+
+class TestLLMProvider:
+    """Tests for the provider base class."""
+
+    def test_incomplete_provider_cannot_be_instantiated(self):
+        class IncompleteProvider(LLMProvider):
+            def list_models(self):
+                return []
+
+        with pytest.raises(TypeError):
+            IncompleteProvider()
+
+
+class TestRegisterProvider:
+    """Tests for provider registration."""
+
+    def test_duplicate_registration_rejected(self, factory):
+        with pytest.raises(ValueError):
+            factory.register_provider("fake", FakeProvider())
+
+    def test_duplicate_lazy_registration_rejected(self, factory):
+        with pytest.raises(ValueError):
+            factory.register_lazy_provider("fake", FakeProvider)
+
+    def test_lazy_provider_loaded_on_first_use(self):
+        factory = LLMFactory()
+        loader = MagicMock(return_value=FakeProvider())
+        factory.register_lazy_provider("fake", loader)
+        loader.assert_not_called()
+
+        factory.create_model("test", "(fake)chat-model")
+        factory.create_model("test", "(fake)text-model")
+        loader.assert_called_once_with()
+
+    def test_lazy_provider_loaded_once_across_threads(self):
+        from concurrent.futures import ThreadPoolExecutor
+        import time
+
+        def load():
+            time.sleep(0.05)
+            return FakeProvider()
+
+        factory = LLMFactory()
+        loader = MagicMock(side_effect=load)
+        factory.register_lazy_provider("fake", loader)
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            providers = list(
+                pool.map(lambda _: factory._get_provider("fake"), range(4))
+            )
+
+        loader.assert_called_once_with()
+        assert all(p is providers[0] for p in providers)
+
+    def test_lazy_provider_listed(self):
+        factory = LLMFactory()
+        factory.register_lazy_provider("fake", FakeProvider)
+        assert factory.list_models() == ["(fake)chat-model", "(fake)text-model"]
+
+
+class TestCacheKey:
+    """Tests for LLM cache key generation."""
+
+    def test_kwarg_order_does_not_matter(self, factory):
+        first = factory._get_llm_cache_key("m", top_p=0.9, max_tokens=100)
+        second = factory._get_llm_cache_key("m", max_tokens=100, top_p=0.9)
+        assert first == second
+        assert hash(first) == hash(second)
+
+    def test_no_kwargs_matches_explicit_defaults(self, factory):
+        assert factory._get_llm_cache_key("m") == factory._get_llm_cache_key(
+            "m", temperature=0.6, enable_prompt_cache=False
+        )
+
+    def test_temperature_rounded(self, factory):
+        assert factory._get_llm_cache_key(
+            "m", temperature=0.61
+        ) == factory._get_llm_cache_key("m", temperature=0.6)
+
+    def test_extract_cache_params_reads_reasoning_budget(self):
+        from_dict = _extract_cache_params({"reasoning_config": {"budget_tokens": 2048}})
+        from_config = _extract_cache_params(
+            {"reasoning_config": ReasoningConfig(enable=True, budget_tokens=2048)}
+        )
+        assert from_dict == from_config
+        assert from_dict.budget_tokens == 2048
+        assert from_dict.temperature == 0.6
+
+    def test_non_scalar_kwargs_ignored(self, factory):
+        assert factory._get_llm_cache_key(
+            "m", callbacks=[object()]
+        ) == factory._get_llm_cache_key("m")
+
+
+class TestCreateModel:
+    """Tests for model creation and caching."""
+
+    def test_unknown_provider_raises(self, factory):
+        with pytest.raises(ValueError):
+            factory.create_model("test", "(other)chat-model")
+
+    def test_cached_instance_reused(self, factory, provider):
+        first = factory.create_model("test", "(fake)chat-model", temperature=0.6)
+        second = factory.create_model("test", "(fake)chat-model", temperature=0.6)
+        assert first is second
+        assert len(provider.created) == 1
+
+    def test_different_settings_not_shared(self, factory, provider):
+        first = factory.create_model("test", "(fake)chat-model", temperature=0.2)
+        second = factory.create_model("test", "(fake)chat-model", temperature=0.8)
+        assert first is not second
+        assert len(provider.created) == 2
+
+    def test_least_recently_used_instance_evicted(self, factory, provider, monkeypatch):
+        monkeypatch.setattr(factory, "_llm_cache_maxsize", 2)
+        first = factory.create_model("test", "(fake)chat-model", temperature=0.1)
+        factory.create_model("test", "(fake)chat-model", temperature=0.2)
+        # Touch the first entry so the second becomes least recently used
+        factory.create_model("test", "(fake)chat-model", temperature=0.1)
+        factory.create_model("test", "(fake)chat-model", temperature=0.3)
+
+        assert len(factory._llm_cache) == 2
+        cached = factory.create_model("test", "(fake)chat-model", temperature=0.1)
+        assert cached is first
+        factory.create_model("test", "(fake)chat-model", temperature=0.2)
+        assert len(provider.created) == 4
+
+    def test_instance_cache_not_shared(self, factory):
+        other = LLMFactory()
+        other.register_provider("fake", FakeProvider())
+        factory.create_model("test", "(fake)chat-model")
+        assert not other._llm_cache
+
+    def test_cache_hit_skips_parsing(self, factory, provider):
+        first = factory.create_model("test", "(fake)chat-model")
+        factory._parse_cache.clear()
+        lookups = provider.capability_lookups
+
+        assert factory.create_model("test", "(fake)chat-model") is first
+        assert provider.capability_lookups == lookups
+
+    def test_same_model_name_on_other_provider_not_shared(self, factory):
+        factory.register_provider("other", FakeProvider("other"))
+        first = factory.create_model("test", "(fake)chat-model")
+        second = factory.create_model("test", "(other)chat-model")
+        assert first is not second
+
+    def test_tools_dropped_for_unsupported_model(self, factory, provider):
+        factory.create_model("test", "(fake)text-model", tools=[MagicMock()])
+        assert provider.created[0][2] is None
+
+
+class TestListModels:
+    """Tests for listing models."""
+
+    def test_all_models(self, factory):
+        assert factory.list_models() == ["(fake)chat-model", "(fake)text-model"]
+
+    def test_filtered_by_capability(self, factory):
+        models = factory.list_models({ModelCapability.TOOL_CALLING})
+        assert models == ["(fake)chat-model"]
+
+    def test_provider_list_not_reused(self, factory, provider):
+        assert factory.list_models() == ["(fake)chat-model", "(fake)text-model"]
+        provider._capabilities = {"new-model": {ModelCapability.TEXT_TO_TEXT}}
+        assert factory.list_models() == ["(fake)new-model"]
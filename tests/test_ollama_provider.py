@@ -0,0 +1,53 @@
+"""Tests for the Ollama provider."""
+
+from unittest.mock import MagicMock, patch
+
+from requests.exceptions import ConnectionError
+
+from aki.llm.providers import ollama as ollama_provider
+from aki.llm.providers.ollama import OllamaProvider
+
+
+class TestOllamaProvider:
+    """Test cases for OllamaProvider."""
+
+    def test_availability_probe_reused(self):
+        """Test that repeated checks within the TTL share one request."""
+        provider = OllamaProvider()
+        provider._session = MagicMock()
+
+        assert provider.is_available()
+        assert provider.capabilities
+        assert provider.is_available()
+        provider._session.get.assert_called_once()
+
+    def test_availability_probe_expires(self, monkeypatch):
+        """Test that the service is probed again once the TTL has passed."""
+        monkeypatch.setattr(ollama_provider, "_PROBE_TTL", 0.0)
+        provider = OllamaProvider()
+        provider._session = MagicMock()
+        provider._session.get.side_effect = ConnectionError()
+
+        assert not provider.is_available()
+        assert provider.capabilities == {}
+        assert provider._session.get.call_count == 2
+
+    def test_model_list_reused(self):
+        """Test that the model list is fetched once within the TTL."""
+        provider = OllamaProvider()
+        provider._session = MagicMock()
+        listing = MagicMock(models=[MagicMock(model="llama3:8b")])
+
+        with patch.object(ollama_provider.ollama, "list", return_value=listing) as ls:
+            assert provider.list_models() == ["llama3:8b"]
+            assert provider.list_models() == ["llama3:8b"]
+        ls.assert_called_once()
+
+    def test_unavailable_model_list_not_cached(self):
+        """Test that an empty list from a down service isn't remembered."""
+        provider = OllamaProvider()
+        provider._session = MagicMock()
+        provider._session.get.side_effect = ConnectionError()
+
+        assert provider.list_models() == []
+        assert provider._models_cache is None
@@ -0,0 +1,85 @@
+"""Tests for the LLM token counter."""
+
+import pytest
+from langchain_core.messages import (
+    AIMessage,
+    AIMessageChunk,
+    HumanMessage,
+    SystemMessage,
+    ToolMessage,
+)
+
+from aki.llm import token_counter
+
+
+MESSAGES = [
+    SystemMessage(content="You are a helpful assistant."),
+    HumanMessage(content="Summarise this: 日本語のテキスト and some emoji 🎉"),
+    AIMessage(content=[{"type": "text", "text": "Sure, here it is."}]),
+    ToolMessage(content='{"result": 42}', tool_call_id="call-1", name="calculator"),
+]
+
+
+class TestStrTokenCounter:
+    """Tests for str_token_counter."""
+
+    def test_counts_tokens(self):
+        assert token_counter.str_token_counter("") == 0
+        assert token_counter.str_token_counter("hello world") > 0
+
+    def test_encoding_reused(self):
+        assert token_counter.get_encoding() is token_counter.get_encoding()
+
+    def test_long_text_counts_cached(self, monkeypatch):
+        text = "The quick brown fox jumps over the lazy dog. " * 20
+        expected = len(token_counter.get_encoding().encode(text))
+        assert token_counter.str_token_counter(text) == expected
+
+        # A cached count is returned without encoding again
+        monkeypatch.setattr(token_counter, "get_encoding", None)
+        assert token_counter.str_token_counter(text) == expected
+
+
+class TestTiktokenCounter:
+    """Tests for tiktoken_counter."""
+
+    def test_long_history_batch_encoded(self, monkeypatch):
+        encoding = token_counter.get_encoding()
+        messages = [
+            HumanMessage(content=f"Message {i}: " + "lorem ipsum dolor " * 30)
+            for i in range(token_counter._MIN_BATCH_SIZE + 2)
+        ]
+        expected = 3 + sum(
+            3 + len(encoding.encode("user")) + len(encoding.encode(m.content))
+            for m in messages
+        )
+        token_counter._count_cache.clear()
+        assert token_counter.tiktoken_counter(messages) == expected
+
+        # Every count was remembered, so nothing needs encoding in a batch again
+        monkeypatch.setattr(encoding, "encode_batch", None)
+        assert token_counter.tiktoken_counter(messages) == expected
+
+    def test_message_subclasses_use_base_role(self):
+        chunk = AIMessageChunk(content="Sure, here it is.")
+        message = AIMessage(content="Sure, here it is.")
+        assert token_counter.tiktoken_counter(
+            [chunk]
+        ) == token_counter.tiktoken_counter([message])
+
+    def test_unsupported_message_type(self):
+        with pytest.raises(ValueError):
+            token_counter.tiktoken_counter([object()])
+
+
+class TestMaxTokenEstimate:
+    """Tests for max_token_estimate."""
+
+    def test_upper_bounds_exact_count(self):
+        exact = token_counter.tiktoken_counter(MESSAGES)
+        assert token_counter.max_token_estimate(MESSAGES) >= exact
+
+    def test_empty_messages(self):
+        assert token_counter.max_token_estimate([]) == token_counter.tiktoken_counter(
+            []
+        )